@@ -1,3 +1,5 @@
+from copy import copy
+
 from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
 from rlbot.utils.structures.game_data_struct import GameTickPacket
 from rlbot.messages.flat.QuickChatSelection import QuickChatSelection # For maneuvers that might use it
@@ -5,13 +7,20 @@ from rlbot.messages.flat.QuickChatSelection import QuickChatSelection # For mane
 # Utilities from the util folder
 from util.ball_prediction_analysis import find_slice_at_time
 from util.boost_pad_tracker import BoostPadTracker
-from util.drive import steer_toward_target # Make sure this is correctly implemented in util/drive.py
+from util.drive import PathPlanner, evaluate_approaches, heading_of, steer_toward_target # Make sure this is correctly implemented in util/drive.py
 from util.sequence import Sequence
 from util.vec import Vec3
 from util.dribble import DribbleController  # Add the new dribble controller
-from util.ball_predictor import find_next_ground_touch, find_best_intercept, find_shot_opportunity
+from util.ball_predictor import find_next_ground_touch, find_best_intercept, find_shot_opportunity, GROUND_BAND, AERIAL_BAND
 from util.decision import decide_action, BotDecision
 from util.position_predictor import PositionPredictor
+from util.tick_context import TickContext, CarState
+from util.prediction_arrays import PredictionArrays, first_index
+from util.prediction_cache import PredictionCache
+from util.aerial_envelope import default_aerial_envelope
+from util.drive_model import MAX_SPEED, default_drive_table
+from util.bounds_pyramid import SPEED_XY, TIME, Z, above, below
+from util.ball_simulator import BallPaths, simulate_balls
 
 # Our maneuver library
 from maneuvers.half_flip import perform_half_flip
@@ -26,17 +35,26 @@ from maneuvers.turtle_recovery import perform_turtle_recovery
 from maneuvers.air_roll_recovery import perform_air_roll_recovery
 
 import math
+import numpy as np
 
 def clamp(value, min_value, max_value):
     return max(min_value, min(value, max_value))
 
+# Rough speed a flip adds to the ball over our own, when we simulate where a hit sends it.
+FLIP_HIT_BONUS = 500
+# How far ahead, and how coarsely, hit outcomes are simulated. Coarse is fine for comparing them with each other.
+HIT_SIMULATION_TIME = 2.0
+HIT_SIMULATION_DT = 1 / 30
+
 class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
 
     def __init__(self, name, team, index):
         super().__init__(name, team, index)
         self.active_sequence: Sequence = None
         self.boost_pad_tracker = BoostPadTracker()
+        self.prediction_cache = PredictionCache()
         self.dribble_controller = DribbleController(self)  # Initialize dribble controller
+        self.path_planner = PathPlanner()
         # Add a timer to prevent flipping too often, for example
         self.last_flip_time = 0.0
         self.flip_cooldown = 2.0 # Cooldown in seconds between flips
@@ -48,6 +66,10 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
         self.boost_pad_tracker.initialize_boosts(self.get_field_info())
         self.logger.info(f"Gemini Agent boost pads initialized. Found {len(self.boost_pad_tracker.boost_pads)} pads.")
         self.last_flip_time = 0.0 # Initialize here in case of match restart
+        # Build the physics lookup tables now rather than on the first tick that needs them.
+        default_drive_table()
+        default_aerial_envelope(with_jump=True)
+        default_aerial_envelope(with_jump=False)
 
     # --- State Machine for Platinum-Level Logic ---
     class BotState:
@@ -64,36 +86,38 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
         ROTATE = 'rotate'
         NONE = 'none'
 
-    def select_state(self, packet, car_location, car_velocity, ball_location, ball_velocity, my_goal, opponent_goal):
+    def select_state(self, ctx: TickContext):
         """
         Determines the bot's high-level state based on field context.
         """
-        # Use ball prediction for intercepts
-        ball_prediction = self.get_ball_prediction_struct()
-        intercept_slice = find_best_intercept(car_location, car_velocity.length(), ball_prediction)
-        dist_to_ball = car_location.dist(ball_location)
-        dist_ball_to_my_goal = ball_location.dist(my_goal)
-        dist_ball_to_opponent_goal = ball_location.dist(opponent_goal)
-        my_car_data = packet.game_cars[self.index]
-        boost = my_car_data.boost
+        car_location = ctx.car.location
+        ball_location = ctx.ball_location
+        # Use ball prediction for intercepts. Ground and aerial are solved together in one pass.
+        ground_intercept, aerial_intercept = ctx.prediction_cache.intercepts(
+            car_location, ctx.car.speed, (GROUND_BAND, AERIAL_BAND),
+            car_forward=ctx.car.orientation.forward, boost=ctx.car.boost)
+        dist_to_ball = ctx.dist_to_ball
+        dist_ball_to_my_goal = ctx.dist_ball_to_my_goal
+        dist_ball_to_opponent_goal = ctx.dist_ball_to_opponent_goal
+        boost = ctx.car.boost
         # Defensive states
         if dist_ball_to_my_goal < 1200 and dist_to_ball > 600:
             return self.BotState.DEFEND_GOAL
         if dist_ball_to_my_goal < 2500 and dist_to_ball < 900:
             return self.BotState.DEFEND_CLEAR
         # Shadowing
-        if dist_ball_to_my_goal < 3000 and dist_to_ball < 1800 and ball_velocity.length() < 700:
+        if dist_ball_to_my_goal < 3000 and dist_to_ball < 1800 and ctx.ball_speed < 700:
             return self.BotState.SHADOW
         # Challenge
         if dist_to_ball < 900 and abs(ball_location.z) < 200:
             return self.BotState.CHALLENGE
-        # Attacking states
-        if ball_location.z > 350 and boost > 20 and dist_to_ball < 1800:
+        # Attacking states. Only commit to an attack when the prediction says we can reach the ball in that band.
+        if ball_location.z > 350 and boost > 20 and dist_to_ball < 1800 and aerial_intercept is not None:
             return self.BotState.ATTACK_AERIAL
-        if dist_ball_to_opponent_goal < 2000 and dist_to_ball < 900:
+        if dist_ball_to_opponent_goal < 2000 and dist_to_ball < 900 and ground_intercept is not None:
             return self.BotState.ATTACK_GROUND
         # Dribble
-        if abs(ball_location.z - car_location.z) < 120 and dist_to_ball < 350 and ball_velocity.length() < 600:
+        if abs(ball_location.z - car_location.z) < 120 and dist_to_ball < 350 and ctx.ball_speed < 600:
             return self.BotState.DRIBBLE
         # Wall play
         if abs(ball_location.y) > 4000 and ball_location.z > 200:
@@ -115,43 +139,62 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
         FLIGHT = 3
         RECOVERY = 4
 
-    def should_attempt_platinum_aerial(self, packet, car_location, car_velocity, car_orientation, my_car_data, ball_prediction, current_time, my_goal, opponent_goal):
+    def should_attempt_platinum_aerial(self, ctx: TickContext, prediction: PredictionArrays):
         """
         Decide if a Platinum-level aerial is appropriate, following the user's breakdown.
         Returns (intercept_point, intercept_time) if possible, else (None, None).
+        Every slice is tested at once; the earliest slice passing all checks wins.
         """
-        best_intercept = None
-        best_time = None
-        for i in range(ball_prediction.num_slices):
-            slice = ball_prediction.slices[i]
-            t = slice.game_seconds - current_time
-            if t < 0.5 or t > 3.0:
-                continue
-            ball_pos = Vec3(slice.physics.location)
-            ball_vel = Vec3(slice.physics.velocity)
-            # Only consider balls at a Platinum aerial height and not too fast horizontally
-            if 300 < ball_pos.z < 1000 and ball_vel.flat().length() < 1800:
-                # Estimate time to reach (simplified: distance / average aerial speed)
-                dist = car_location.dist(ball_pos)
-                avg_aerial_speed = 1300  # Platinum-level
-                time_to_reach = dist / avg_aerial_speed
-                # Estimate boost needed (simplified: 33 units/sec vertical, 1 boost = 33 units)
-                height_needed = ball_pos.z - car_location.z
-                boost_needed = max(0, height_needed / 33)
-                if abs(time_to_reach - t) < 0.35 and my_car_data.boost > boost_needed + 10:
-                    # Check if it's a shot or clear opportunity
-                    is_offense = (ball_pos - opponent_goal).length() < (ball_pos - my_goal).length()
-                    is_defense = (ball_pos - my_goal).length() < 2000
-                    if is_offense or is_defense:
-                        best_intercept = ball_pos
-                        best_time = t
-                        break
-        return best_intercept, best_time
-
-    def perform_platinum_aerial(self, packet, car_location, car_velocity, car_orientation, my_car_data, intercept_point, intercept_time):
+        my_car = ctx.car
+        car_location = my_car.location
+        car_velocity = my_car.velocity
+        # Nothing moves faster than MAX_SPEED, so the ball's arcs tell us analytically when it could first be reached
+        # at aerial height at all. Slices before then (or everything, if never) can't pass the envelope either.
+        earliest = ctx.prediction_cache.arc_intercept(car_location, MAX_SPEED, *AERIAL_BAND)
+        if earliest is None or earliest.time > ctx.time + 3.0:
+            return None, None
+        # The time window, height band and speed cap are plain ranges, so the bounds pyramid can rule out most
+        # slices before we pay for envelope lookups. The time bounds are padded a little since the exact check below
+        # runs in float32.
+        rows = ctx.prediction_cache.bounds().candidate_rows([
+            (TIME, max(ctx.time + 0.5, earliest.time) - 1e-3, ctx.time + 3.0 + 1e-3),
+            (Z, above(300), below(1000)),
+            (SPEED_XY, -math.inf, below(1800)),
+        ])
+        if len(rows) == 0:
+            return None, None
+        t = prediction.times[rows] - ctx.time
+        ball_pos = prediction.locations[rows]
+        ball_vel = prediction.velocities[rows]
+        ball_z = ball_pos[:, 2]
+        mask = (t >= 0.5) & (t <= 3.0)
+        # Only consider balls at a Platinum aerial height and not too fast horizontally
+        mask &= (300 < ball_z) & (ball_z < 1000)
+        mask &= np.hypot(ball_vel[:, 0], ball_vel[:, 1]) < 1800
+        # Look up how soon, and for how much boost, we could be at each slice. Horizontal distance is measured from
+        # where our current velocity would carry us by then, which is how the envelope expects it.
+        envelope = default_aerial_envelope(with_jump=my_car.has_wheel_contact)
+        drift_x = ball_pos[:, 0] - (car_location.x + car_velocity.x * t)
+        drift_y = ball_pos[:, 1] - (car_location.y + car_velocity.y * t)
+        earliest_time, boost_needed = envelope.lookup(np.hypot(drift_x, drift_y), ball_z - car_location.z,
+                                                      car_velocity.z)
+        mask &= (earliest_time <= t) & (my_car.boost > boost_needed + 10)
+        # Check if it's a shot or clear opportunity
+        dist_to_my_goal = prediction.distances_to(ctx.my_goal)[rows]
+        is_offense = prediction.distances_to(ctx.opponent_goal)[rows] < dist_to_my_goal
+        is_defense = dist_to_my_goal < 2000
+        mask &= is_offense | is_defense
+        i = first_index(mask)
+        if i < 0:
+            return None, None
+        return Vec3(*ball_pos[i]), float(t[i])
+
+    def perform_platinum_aerial(self, ctx: TickContext, intercept_point, intercept_time):
         """
         Executes a Platinum-level aerial using a state machine and proportional controller.
         """
+        my_car = ctx.car
+        car_location = my_car.location
         # State variables
         if not hasattr(self, 'aerial_state'):
             self.aerial_state = self.AerialState.IDLE
@@ -161,9 +204,9 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             self.aerial_has_jumped = False
             self.aerial_has_double_jumped = False
         controls = SimpleControllerState()
-        current_time = packet.game_info.seconds_elapsed
+        current_time = ctx.time
         # Reset aerial state if bot is on ground after an aerial attempt
-        if my_car_data.has_wheel_contact and self.aerial_state != self.AerialState.IDLE:
+        if my_car.has_wheel_contact and self.aerial_state != self.AerialState.IDLE:
             self.aerial_state = self.AerialState.IDLE
             self.aerial_has_jumped = False
             self.aerial_has_double_jumped = False
@@ -172,10 +215,10 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             # Drive to takeoff spot (under or slightly ahead of intercept)
             takeoff_spot = Vec3(intercept_point.x, intercept_point.y, 0)
             self.aerial_takeoff_spot = takeoff_spot
-            dist = car_location.flat().dist(takeoff_spot.flat())
+            dist = car_location.flat_dist(takeoff_spot)
             if dist > 120:
                 controls.throttle = 1.0
-                controls.steer = clamp(steer_toward_target(my_car_data, takeoff_spot), -1.0, 1.0)
+                controls.steer = clamp(steer_toward_target(my_car, takeoff_spot), -1.0, 1.0)
                 controls.boost = False
                 # Platinum nuance: alignment might not be perfect
                 return controls
@@ -210,7 +253,7 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
         if self.aerial_state == self.AerialState.FLIGHT:
             # In-air flight & correction
             to_target = (intercept_point - car_location).normalized()
-            forward = car_orientation.forward
+            forward = my_car.orientation.forward
             error = to_target - forward
             # Proportional controller for pitch/yaw (Platinum: wobbly, not perfect)
             controls.pitch = clamp(error.z * 2, -1, 1)
@@ -244,8 +287,70 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             return controls
         return controls
 
-    def execute_state(self, state, packet, car_location, car_velocity, ball_location, ball_velocity, my_goal, opponent_goal, my_car_data):
+    def simulate_hits(self, ctx: TickContext, directions: np.ndarray, hit_speed: float) -> BallPaths:
+        """
+        Simulates the ball after we hit it along each of directions ((K, 3) unit vectors), all in one batch. A hit
+        brings the ball's speed along the direction up to hit_speed and leaves the rest of its velocity alone.
+        """
+        ball_velocity = np.array([ctx.ball_velocity.x, ctx.ball_velocity.y, ctx.ball_velocity.z])
+        along = directions @ ball_velocity
+        velocities = ball_velocity + directions * np.maximum(hit_speed - along, 0)[:, None]
+        locations = np.tile([ctx.ball_location.x, ctx.ball_location.y, ctx.ball_location.z], (len(directions), 1))
+        return simulate_balls(locations, velocities, HIT_SIMULATION_TIME, dt=HIT_SIMULATION_DT, record_every=1)
+
+    def shot_would_score(self, ctx: TickContext, to_ball: Vec3) -> bool:
+        """
+        Whether flipping into the ball now scores in most of the outcomes we simulate, which spread the contact
+        direction up to 0.4 radians either side of to_ball since we won't hit it dead centre.
+        """
+        heading = math.atan2(to_ball.y, to_ball.x) + np.linspace(-0.4, 0.4, 9)
+        directions = np.column_stack((np.cos(heading), np.sin(heading), np.full(len(heading), 0.15)))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        paths = self.simulate_hits(ctx, directions, ctx.car.speed + FLIP_HIT_BONUS)
+        return np.mean(paths.goal_sides == np.sign(ctx.opponent_goal.y)) >= 0.5
+
+    def best_clear_target(self, ctx: TickContext) -> Vec3:
+        """
+        Where to clear the ball to: the candidate whose simulated clear never comes closer to our goal than the others
+        do. Clears into our own goal never win. Ties go to the usual far-post target.
+
+        Simulating the clears is the expensive part, so the answer is remembered for the current prediction and only
+        worked out again when the ball, our speed or the side we're on changes.
+        """
+        side = 1000 if ctx.car.location.x < 0 else -1000
+        ball = ctx.ball_location
+        velocity = ctx.ball_velocity
+        key = ('clear_target', side, ctx.my_goal.y, ball.x, ball.y, ball.z, velocity.x, velocity.y, velocity.z,
+               ctx.car.speed)
+        return ctx.prediction_cache.memoize(key, lambda: self._simulate_clear_target(ctx, side))
+
+    def _simulate_clear_target(self, ctx: TickContext, side: float) -> Vec3:
+        my_goal = ctx.my_goal
+        opponent_goal = ctx.opponent_goal
+        upfield = math.copysign(3000, opponent_goal.y)
+        candidates = [opponent_goal + Vec3(side, 0, 0), opponent_goal + Vec3(-side, 0, 0),
+                      Vec3(3 * side, upfield, 0), Vec3(-3 * side, upfield, 0), Vec3(4 * side, 0, 0),
+                      Vec3(-4 * side, 0, 0)]
+        ball = ctx.ball_location
+        directions = np.array([[c.x - ball.x, c.y - ball.y, 0] for c in candidates])
+        directions /= np.maximum(np.linalg.norm(directions, axis=1), 1)[:, None]
+        # Hard and high
+        directions[:, 2] = 0.3
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        paths = self.simulate_hits(ctx, directions, ctx.car.speed + FLIP_HIT_BONUS)
+        offsets = paths.locations - [my_goal.x, my_goal.y, my_goal.z]
+        closest = np.sqrt(np.einsum('ijk,ijk->ij', offsets, offsets)).min(axis=1)
+        closest[paths.goal_sides == np.sign(my_goal.y)] = -np.inf
+        return candidates[int(np.argmax(closest))]
+
+    def execute_state(self, state, ctx: TickContext):
         controls = SimpleControllerState()
+        packet = ctx.packet
+        my_car = ctx.car
+        car_location = my_car.location
+        ball_location = ctx.ball_location
+        my_goal = ctx.my_goal
+        opponent_goal = ctx.opponent_goal
         # --- Attacking ---
         if state == self.BotState.ATTACK_GROUND:
             # Power shot logic: line up, accelerate, flip into ball
@@ -253,33 +358,29 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             to_ball = (ball_location - car_location).normalized()
             to_goal = (target - ball_location).normalized()
             alignment = to_ball.dot(to_goal)
-            if alignment > 0.7 and car_location.dist(ball_location) < 300:
-                # Close and lined up: flip for power shot
-                if self.active_sequence is None:
-                    self.active_sequence = perform_front_flip(self)
-                    return self.active_sequence.tick(packet)
-            # Otherwise, drive to line up
+            if car_location.dist(ball_location) < 300 and self.active_sequence is None and \
+                    (alignment > 0.7 or self.shot_would_score(ctx, to_ball)):
+                # Close and lined up, or the shot goes in anyway: flip for power shot
+                self.active_sequence = perform_front_flip(self)
+                return self.active_sequence.tick(packet)
+            # Otherwise, drive a path that reaches the ball already facing the goal
+            self.path_planner.plan(my_car, ball_location, heading_of(target - ball_location))
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, ball_location), -1.0, 1.0)
+            controls.steer = clamp(self.path_planner.steer(my_car), -1.0, 1.0)
             return controls
         if state == self.BotState.ATTACK_AERIAL:
             # --- Platinum-level aerial logic ---
-            ball_prediction = self.get_ball_prediction_struct()
-            from util.orientation import Orientation
-            car_orientation = Orientation(my_car_data.physics.rotation)
-            current_time = packet.game_info.seconds_elapsed
-            intercept_point, intercept_time = self.should_attempt_platinum_aerial(
-                packet, car_location, car_velocity, car_orientation, my_car_data, ball_prediction, current_time, my_goal, opponent_goal)
+            intercept_point, intercept_time = self.should_attempt_platinum_aerial(ctx, ctx.prediction)
             if intercept_point is not None:
                 # Always attempt a jump if a valid intercept is found
-                return self.perform_platinum_aerial(packet, car_location, car_velocity, car_orientation, my_car_data, intercept_point, intercept_time)
+                return self.perform_platinum_aerial(ctx, intercept_point, intercept_time)
             # If not a good aerial, fallback to default (drive towards ball)
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, ball_location), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, ball_location), -1.0, 1.0)
             return controls
         if state == self.BotState.DRIBBLE:
             # Use dribble controller
-            controls = self.dribble_controller.execute(packet)
+            controls = self.dribble_controller.execute(ctx)
             if isinstance(controls, SimpleControllerState):
                 return controls
             elif isinstance(controls, Sequence):
@@ -288,33 +389,31 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
         if state == self.BotState.WALL_PLAY:
             # --- Wall jump logic for Platinum ---
             # If the bot is on the wall and the ball is high, jump and boost off the wall
-            if not my_car_data.has_wheel_contact and abs(car_location.z) > 200:
+            if not my_car.has_wheel_contact and abs(car_location.z) > 200:
                 controls.jump = True
                 controls.boost = True
                 # Aim nose toward ball
                 to_ball = (ball_location - car_location).normalized()
-                from util.orientation import Orientation
-                car_orientation = Orientation(my_car_data.physics.rotation)
-                forward = car_orientation.forward
+                forward = my_car.orientation.forward
                 error = to_ball - forward
                 controls.pitch = clamp(error.z * 2, -1, 1)
                 controls.yaw = clamp(error.y * 2, -1, 1)
                 return controls
             # Otherwise, drive up the wall toward the ball
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, ball_location), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, ball_location), -1.0, 1.0)
             return controls
         if state == self.BotState.REBOUND:
             # After shot, keep moving forward for follow-up
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, opponent_goal), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, opponent_goal), -1.0, 1.0)
             return controls
         # --- Defending ---
         if state == self.BotState.DEFEND_GOAL:
             # Position in net, face ball, block shot
             goal_line = my_goal + (ball_location - my_goal).normalized() * 300
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, goal_line), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, goal_line), -1.0, 1.0)
             # If ball is close, flip to save
             if car_location.dist(ball_location) < 350:
                 if self.active_sequence is None:
@@ -322,10 +421,10 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
                     return self.active_sequence.tick(packet)
             return controls
         if state == self.BotState.DEFEND_CLEAR:
-            # Hit ball hard and high towards side or upfield
-            clear_target = opponent_goal + Vec3(1000 if car_location.x < 0 else -1000, 0, 0)
+            # Hit ball hard and high towards side or upfield, wherever the simulated clear stays furthest from our goal
+            clear_target = self.best_clear_target(ctx)
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, clear_target), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, clear_target), -1.0, 1.0)
             if car_location.dist(ball_location) < 350:
                 if self.active_sequence is None:
                     self.active_sequence = perform_front_flip(self)
@@ -335,7 +434,7 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             # Stay between ball and net, match speed, delay
             shadow_pos = my_goal + (ball_location - my_goal).normalized() * 800
             controls.throttle = 0.5
-            controls.steer = clamp(steer_toward_target(my_car_data, shadow_pos), -1.0, 1.0)
+            controls.steer = clamp(steer_toward_target(my_car, shadow_pos), -1.0, 1.0)
             return controls
         if state == self.BotState.CHALLENGE:
             # Flip into ball for 50/50
@@ -345,67 +444,59 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
             return controls
         if state == self.BotState.GET_BOOST:
             # Go for nearest boost pad
-            best_pad = self.boost_pad_tracker.get_best_boost(car_location)
+            best_pad = self.boost_pad_tracker.get_best_boost(car_location, my_car.velocity, my_car.orientation.forward,
+                                                             my_car.boost)
             if best_pad:
                 controls.throttle = 1.0
-                controls.steer = clamp(steer_toward_target(my_car_data, best_pad.location), -1.0, 1.0)
+                controls.steer = clamp(steer_toward_target(my_car, best_pad.location), -1.0, 1.0)
                 return controls
         # --- Default/Rotation ---
         if state == self.BotState.ROTATE:
-            # Rotate back post or cover midfield
-            if self.team == 0:
-                back_post = Vec3(-800, -5120, 0) if car_location.x < 0 else Vec3(800, -5120, 0)
-            else:
-                back_post = Vec3(-800, 5120, 0) if car_location.x < 0 else Vec3(800, 5120, 0)
+            # Rotate to whichever of our posts we reach first, counting the turn to face it
+            posts = [my_goal + Vec3(-800, 0, 0), my_goal + Vec3(800, 0, 0)]
+            approaches = evaluate_approaches(my_car, posts)
+            fastest = approaches.fastest()
+            back_post = posts[fastest]
+            steer = float(approaches.steers[fastest])
+            # Pick up boost on the way if it costs at most a second.
+            if my_car.boost < 50:
+                route = self.boost_pad_tracker.route_via_boost(car_location, my_car.velocity,
+                                                               my_car.orientation.forward, my_car.boost, back_post,
+                                                               min_boost=12, max_extra_time=1.0)
+                if route is not None and route.pads:
+                    back_post = self.boost_pad_tracker.boost_pads[route.pads[0]].location
+                    steer = steer_toward_target(my_car, back_post)
             controls.throttle = 1.0
-            controls.steer = clamp(steer_toward_target(my_car_data, back_post), -1.0, 1.0)
+            controls.steer = clamp(steer, -1.0, 1.0)
             return controls
         return controls
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
-        current_time = packet.game_info.seconds_elapsed
         self.boost_pad_tracker.update_boost_status(packet)
-        controls = SimpleControllerState()
-
-        my_car_data = packet.game_cars[self.index]
-        car_location = Vec3(my_car_data.physics.location)
-        car_velocity = Vec3(my_car_data.physics.velocity)
-        ball_location = Vec3(packet.game_ball.physics.location)
-        ball_velocity = Vec3(packet.game_ball.physics.velocity)
 
-        from util.orientation import Orientation
-        car_orientation = Orientation(my_car_data.physics.rotation)
-
-        # Define goal locations
-        if self.team == 0:
-            my_goal = Vec3(0, -5120, 0)
-            opponent_goal = Vec3(0, 5120, 0)
-        else:
-            my_goal = Vec3(0, 5120, 0)
-            opponent_goal = Vec3(0, -5120, 0)
+        # Decode the packet and fetch the ball prediction exactly once; everything below reads from this snapshot.
+        self.prediction_cache.update(self, packet)
+        ctx = TickContext(packet, self.index, self.team, self.prediction_cache)
 
         # --- Platinum-Level State Machine ---
-        state = self.select_state(packet, car_location, car_velocity, ball_location, ball_velocity, my_goal, opponent_goal)
-        controls = self.execute_state(state, packet, car_location, car_velocity, ball_location, ball_velocity, my_goal, opponent_goal, my_car_data)
+        state = self.select_state(ctx)
+        controls = self.execute_state(state, ctx)
         if hasattr(controls, 'steer'):
+            # Maneuvers and control templates hand out shared controls objects, so clamp a copy rather than them.
+            controls = copy(controls)
             controls.steer = float(clamp(controls.steer, -1.0, 1.0))
         return controls
 
-    def get_car_forward_vector(self, packet: GameTickPacket) -> Vec3:
+    def get_car_forward_vector(self, ctx: TickContext) -> Vec3:
         """Returns a Vec3 representing the forward direction of the car."""
-        from util.orientation import Orientation
-        my_car = packet.game_cars[self.index]
-        car_orientation = Orientation(my_car.physics.rotation)
-        return car_orientation.forward
-
-    def handle_recovery(self, car_data, controls_to_modify: SimpleControllerState):
-        from util.orientation import Orientation
-        import math
-        car_orientation = Orientation(car_data.physics.rotation)
+        return ctx.car.orientation.forward
+
+    def handle_recovery(self, car: CarState, controls_to_modify: SimpleControllerState):
+        car_orientation = car.orientation
         car_up = car_orientation.up
         car_forward = car_orientation.forward
         car_right = car_orientation.right
-        car_velocity_vec = Vec3(car_data.physics.velocity)
+        car_velocity_vec = car.velocity
 
         # If turtled (on roof), use jump+roll to try to flip over
         if car_up.z < -0.5: # Condition for being on the roof
@@ -445,14 +536,12 @@ class GeminiAgent(BaseAgent): # Renamed from MyRLBotAgent
 
         return controls_to_modify # Always return controls if recovery is handled
 
-    def attempt_airborne_leveling(self, car_data, controls_to_modify: SimpleControllerState):
-        from util.orientation import Orientation
-        import math
-        car_orientation = Orientation(car_data.physics.rotation)
+    def attempt_airborne_leveling(self, car: CarState, controls_to_modify: SimpleControllerState):
+        car_orientation = car.orientation
         car_up = car_orientation.up
         car_forward = car_orientation.forward
         car_right = car_orientation.right
-        car_velocity_vec = Vec3(car_data.physics.velocity)
+        car_velocity_vec = car.velocity
 
         # --- Roll Control (for airborne but not turtled) ---
         controls_to_modify.roll = 0
@@ -1,10 +1,14 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_air_roll_recovery(agent):
     """
     Returns a Sequence object for a basic air roll recovery (wheels down).
     """
+    return maneuver('air_roll_recovery', _build_air_roll_recovery)
+
+def _build_air_roll_recovery():
     return Sequence([
         ControlStep(duration=0.5, controls=SimpleControllerState(roll=1.0)),
         ControlStep(duration=0.5, controls=SimpleControllerState(roll=-1.0)),
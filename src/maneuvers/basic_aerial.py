@@ -1,4 +1,5 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver, quantize
 from util.sequence import Sequence, ControlStep
 from util.vec import Vec3
 
@@ -11,7 +12,11 @@ def perform_basic_aerial(agent, target_location, duration=1.0):
     car_loc = Vec3(car.physics.location)
     direction = (target_location - car_loc).normalized()
     pitch = -1.0 if direction.z > 0.2 else 0.0
-    yaw = direction.y / max(abs(direction.x) + abs(direction.y), 1e-5)
+    yaw = quantize(direction.y / max(abs(direction.x) + abs(direction.y), 1e-5), 0.05)
+    duration = quantize(duration, 0.05)
+    return maneuver(('basic_aerial', pitch, yaw, duration), _build_basic_aerial, pitch, yaw, duration)
+
+def _build_basic_aerial(pitch, yaw, duration):
     return Sequence([
         ControlStep(duration=0.08, controls=SimpleControllerState(jump=True, boost=True, pitch=pitch, yaw=yaw)),
         ControlStep(duration=0.08, controls=SimpleControllerState(jump=False, boost=True, pitch=pitch, yaw=yaw)),
@@ -1,4 +1,5 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_catch(agent, ball_state):
@@ -9,7 +10,11 @@ def perform_catch(agent, ball_state):
     rel_vel = ball_state['relative_velocity']
     distance = ball_state['distance']
     # Gentle catch if ball is coming down
-    if rel_vel.z < -100 and distance < 200:
+    gentle = rel_vel.z < -100 and distance < 200
+    return maneuver(('catch', gentle), _build_catch, gentle)
+
+def _build_catch(gentle):
+    if gentle:
         return Sequence([
             ControlStep(duration=0.1, controls=SimpleControllerState(throttle=0.3)),
             ControlStep(duration=0.1, controls=SimpleControllerState(throttle=0.5))
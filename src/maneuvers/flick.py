@@ -1,4 +1,5 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_flick(agent, flick_type='forward'):
@@ -6,14 +7,13 @@ def perform_flick(agent, flick_type='forward'):
     Returns a Sequence for different types of flicks.
     Types: 'forward', 'diagonal_right', 'diagonal_left', '45_right', '45_left'
     """
-    if flick_type == 'forward':
-        return Sequence([
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.1, controls=SimpleControllerState(jump=True, pitch=-1)),
-            ControlStep(duration=0.7, controls=SimpleControllerState())
-        ])
-    elif flick_type.startswith('diagonal'):
+    # Default to forward flick if type not recognized
+    if not flick_type.startswith(('diagonal', '45')):
+        flick_type = 'forward'
+    return maneuver(('flick', flick_type), _build_flick, flick_type)
+
+def _build_flick(flick_type):
+    if flick_type.startswith('diagonal'):
         right = flick_type.endswith('right')
         return Sequence([
             ControlStep(duration=0.05, controls=SimpleControllerState(jump=True)),
@@ -37,5 +37,9 @@ def perform_flick(agent, flick_type='forward'):
             )),
             ControlStep(duration=0.7, controls=SimpleControllerState())
         ])
-    # Default to forward flick if type not recognized
-    return perform_flick(agent, 'forward')
+    return Sequence([
+        ControlStep(duration=0.05, controls=SimpleControllerState(jump=True)),
+        ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
+        ControlStep(duration=0.1, controls=SimpleControllerState(jump=True, pitch=-1)),
+        ControlStep(duration=0.7, controls=SimpleControllerState())
+    ])
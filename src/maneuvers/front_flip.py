@@ -1,10 +1,14 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_front_flip(agent):
     """
     Returns a Sequence object for a front flip.
     """
+    return maneuver('front_flip', _build_front_flip)
+
+def _build_front_flip():
     return Sequence([
         ControlStep(duration=0.05, controls=SimpleControllerState(jump=True, pitch=0)), # Initial jump
         ControlStep(duration=0.05, controls=SimpleControllerState(jump=False, pitch=0)),# Release jump
@@ -1,10 +1,14 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_half_flip(agent):
     """
     Returns a Sequence object for a half-flip (backflip, cancel, air roll recovery).
     """
+    return maneuver('half_flip', _build_half_flip)
+
+def _build_half_flip():
     return Sequence([
         ControlStep(duration=0.08, controls=SimpleControllerState(jump=True, pitch=1.0, throttle=-1.0)),  # Backflip
         ControlStep(duration=0.10, controls=SimpleControllerState(jump=False, pitch=1.0, throttle=-1.0)), # Release jump
@@ -1,10 +1,14 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver
 from util.sequence import Sequence, ControlStep
 
 def perform_kickoff_flip(agent):
     """
     Improved kickoff: boost straight, steer toward ball, flip at optimal distance.
     """
+    return maneuver('kickoff_flip', _build_kickoff_flip)
+
+def _build_kickoff_flip():
     return Sequence([
         ControlStep(duration=0.32, controls=SimpleControllerState(throttle=1.0, boost=True)),
         ControlStep(duration=0.04, controls=SimpleControllerState(jump=True, pitch=0, throttle=1.0, boost=True)),
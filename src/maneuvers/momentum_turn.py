@@ -1,4 +1,5 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver, quantize
 from util.sequence import Sequence, ControlStep
 
 def perform_momentum_turn(agent, turn_direction, keep_speed=True):
@@ -6,6 +7,11 @@ def perform_momentum_turn(agent, turn_direction, keep_speed=True):
     Returns a Sequence for maintaining momentum while turning.
     Uses powerslide for sharp turns while maintaining speed.
     """
+    turn_direction = quantize(turn_direction, 0.05)
+    keep_speed = bool(keep_speed)
+    return maneuver(('momentum_turn', turn_direction, keep_speed), _build_momentum_turn, turn_direction, keep_speed)
+
+def _build_momentum_turn(turn_direction, keep_speed):
     return Sequence([
         ControlStep(duration=0.2, controls=SimpleControllerState(
             throttle=1.0 if keep_speed else 0.5,
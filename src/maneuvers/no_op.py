@@ -1,8 +1,13 @@
 from rlbot.agents.base_agent import SimpleControllerState
+from maneuvers.registry import maneuver, quantize
 from util.sequence import Sequence, ControlStep
 
 def perform_no_op(duration=0.1):
     """Returns a sequence that does nothing for a specified duration."""
+    duration = quantize(duration, 1 / 120)
+    return maneuver(('no_op', duration), _build_no_op, duration)
+
+def _build_no_op(duration):
     return Sequence([
         ControlStep(duration=duration, controls=SimpleControllerState())
     ])
@@ -0,0 +1,20 @@
+from typing import Callable, Dict, Hashable
+
+from util.sequence import Sequence
+
+_templates: Dict[Hashable, Sequence] = {}
+
+def maneuver(key: Hashable, build: Callable[..., Sequence], *args) -> Sequence:
+    """
+    Returns a fresh cursor over the template stored under key, building the template with build(*args) the first
+    time. Every cursor shares the template's steps and controller states, so build must only use ControlSteps, and
+    nobody may change the controls a cursor hands out.
+    """
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = build(*args)
+    return template.cursor()
+
+def quantize(value: float, step: float) -> float:
+    """Rounds value to a multiple of step, so nearby parameters share one template."""
+    return round(value / step) * step
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The bot runs with src/ as its working directory and imports util.x directly; do the same for the tests.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
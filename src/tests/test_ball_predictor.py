@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+
+from util.ball_predictor import AERIAL_BAND, GROUND_BAND, HIGH_BAND, INTERCEPT_GRACE, solve_arc_intercept, \
+    solve_intercepts
+from util.ball_simulator import simulate_balls
+from util.drive_model import default_drive_table
+from util.prediction_arrays import PredictionArrays, first_index
+from util.prediction_events import PredictionEvents
+from util.vec import Vec3
+
+
+def _prediction(location, velocity, start_time=100.0) -> PredictionArrays:
+    # A six second prediction from the batched simulator, which has drag and bounces like the game's.
+    paths = simulate_balls(location, velocity, 6.0)
+    ball_prediction = BallPrediction()
+    ball_prediction.num_slices = count = paths.locations.shape[1] - 1
+    for i in range(count):
+        physics = ball_prediction.slices[i].physics
+        physics.location.x, physics.location.y, physics.location.z = paths.locations[0, i + 1].tolist()
+        physics.velocity.x, physics.velocity.y, physics.velocity.z = paths.velocities[0, i + 1].tolist()
+        ball_prediction.slices[i].game_seconds = start_time + (i + 1) / 60
+    return PredictionArrays(ball_prediction)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_arc_intercept_is_feasible_and_never_later_than_a_feasible_slice(seed):
+    rng = random.Random(seed)
+    prediction = _prediction((rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), rng.uniform(93, 1500)),
+                             (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), rng.uniform(-800, 1200)))
+    car = Vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), 17)
+    car_speed = rng.uniform(0, 2300)
+    min_height, max_height = rng.choice([(0, 300), (300, 1000), (0, 2100)])
+
+    intercept = solve_arc_intercept(car, car_speed, prediction, PredictionEvents(prediction), min_height, max_height)
+
+    speed = max(car_speed, 400)
+    start_time = float(prediction.times[0])
+
+    def feasible(times):
+        locations, _ = prediction.sample(times)
+        distances = np.linalg.norm(locations - (car.x, car.y, car.z), axis=1)
+        heights = locations[:, 2]
+        return (speed * (times - start_time + INTERCEPT_GRACE) >= distances) & (min_height <= heights) & \
+            (heights <= max_height)
+
+    bound = first_index(feasible(prediction.times.astype(float)))
+    if intercept is None:
+        assert bound < 0
+        return
+    assert feasible(np.array([intercept.time]))[0]
+    if bound >= 0:
+        assert intercept.time <= prediction.times[bound]
+
+
+@pytest.mark.parametrize('use_drive_table', [False, True])
+@pytest.mark.parametrize('seed', range(100))
+def test_intercepts_match_checking_every_slice(seed, use_drive_table):
+    rng = random.Random(seed)
+    prediction = _prediction((rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), rng.uniform(93, 1500)),
+                             (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), rng.uniform(-800, 1200)))
+    car = Vec3(rng.uniform(-3500, 3500), rng.uniform(-4500, 4500), 17)
+    car_speed = rng.uniform(0, 2300)
+    forward = Vec3(rng.uniform(-1, 1), rng.uniform(-1, 1), 0).normalized() if use_drive_table else None
+    boost = rng.uniform(0, 100)
+    bands = (GROUND_BAND, AERIAL_BAND, HIGH_BAND)
+
+    intercepts = solve_intercepts(car, car_speed, prediction, bands, car_forward=forward, boost=boost)
+
+    offset = prediction.locations - (car.x, car.y, car.z)
+    if forward is None:
+        travel = np.linalg.norm(offset, axis=1) / max(car_speed, 400)
+    else:
+        angle = np.arctan2(forward.x * offset[:, 1] - forward.y * offset[:, 0],
+                           forward.x * offset[:, 0] + forward.y * offset[:, 1])
+        travel = default_drive_table().time_to_reach(car_speed, np.hypot(offset[:, 0], offset[:, 1]), angle, boost)
+    reachable = (prediction.times - prediction.times[0]) - travel > -INTERCEPT_GRACE
+    heights = prediction.locations[:, 2]
+    for (min_height, max_height), intercept in zip(bands, intercepts):
+        expected = first_index(reachable & (min_height <= heights) & (heights <= max_height))
+        assert (intercept.index if intercept is not None else -1) == expected
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.ball_simulator import BACK_WALL, BALL_MAX_SPEED, BALL_RADIUS, CEILING, GOAL_HALF_WIDTH, GOAL_HEIGHT, \
+    RESTITUTION, SIDE_WALL, simulate_balls
+
+
+@pytest.mark.parametrize('side', [1, -1])
+def test_straight_shot_into_the_goal_is_scored(side):
+    paths = simulate_balls((0, side * 3000, 93), (0, side * 3000, 0), 3.0)
+
+    assert paths.goal_sides.tolist() == [side]
+    # A little over the straight-line time, since drag slows the ball down.
+    assert (GOAL_THRESHOLD - 3000) / 3000 < paths.goal_times[0] < 1.0
+    # A scored ball stops where it went in.
+    assert abs(paths.locations[0, -1, 1]) >= GOAL_THRESHOLD
+    np.testing.assert_array_equal(paths.velocities[0, -1], 0)
+
+
+@pytest.mark.parametrize('location', [(2000, 3000, 93), (0, 3000, 1000)])
+def test_shot_outside_the_goal_mouth_bounces_off_the_back_wall(location):
+    paths = simulate_balls(location, (0, 2500, 0), 3.0)
+
+    assert paths.goal_sides.tolist() == [0]
+    assert np.isinf(paths.goal_times[0])
+    assert paths.locations[0, :, 1].max() <= BACK_WALL - BALL_RADIUS + 1e-6
+    # It comes back out at about RESTITUTION of the speed it went in with.
+    coming_back = paths.velocities[0, :, 1].min()
+    assert -0.65 * 2500 < coming_back < -0.5 * 2500
+
+
+def test_dropped_ball_bounces_with_restitution():
+    paths = simulate_balls((0, 0, 500), (0, 0, 0), 2.0, record_every=1)
+    vertical = paths.velocities[0, :, 2]
+    bounce = int(np.argmax(vertical > 0))
+
+    assert paths.locations[0, :, 2].min() >= BALL_RADIUS
+    assert vertical[bounce] == pytest.approx(-RESTITUTION * vertical[bounce - 1], rel=0.05)
+
+
+def test_balls_stay_inside_the_arena():
+    rng = np.random.default_rng(0)
+    count = 200
+    locations = np.column_stack((rng.uniform(-3500, 3500, count), rng.uniform(-4500, 4500, count),
+                                 rng.uniform(100, 1800, count)))
+    velocities = rng.uniform(-4000, 4000, (count, 3))
+    paths = simulate_balls(locations, velocities, 4.0)
+
+    scored = np.isfinite(paths.goal_times)
+    x, y, z = np.moveaxis(paths.locations[~scored], 2, 0)
+    assert np.all(np.abs(x) <= SIDE_WALL - BALL_RADIUS + 1e-6)
+    # Only the goal mouths go past the back walls, and nothing gets GOAL_THRESHOLD deep without being scored.
+    in_mouth = (np.abs(x) < GOAL_HALF_WIDTH) & (z < GOAL_HEIGHT)
+    assert np.all(np.abs(y[~in_mouth]) <= BACK_WALL - BALL_RADIUS + 1e-6)
+    assert np.all(np.abs(y) < GOAL_THRESHOLD)
+    assert np.all((BALL_RADIUS <= z) & (z <= CEILING - BALL_RADIUS + 1e-6))
+    assert np.all(paths.goal_sides[~scored] == 0)
+    assert np.all(np.abs(paths.goal_sides[scored]) == 1)
+
+
+def test_batch_matches_simulating_each_ball_alone():
+    locations = [(0, 3000, 93), (2000, 3000, 93), (-3000, -1000, 1500)]
+    velocities = [(0, 3000, 0), (0, 2500, 0), (-2500, -1500, 800)]
+    batch = simulate_balls(locations, velocities, 3.0)
+
+    for i, (location, velocity) in enumerate(zip(locations, velocities)):
+        alone = simulate_balls(location, velocity, 3.0)
+        np.testing.assert_allclose(batch.locations[i], alone.locations[0])
+        np.testing.assert_allclose(batch.velocities[i], alone.velocities[0])
+        assert batch.goal_times[i] == alone.goal_times[0]
+        assert batch.goal_sides[i] == alone.goal_sides[0]
+
+
+def test_speed_is_capped_and_samples_are_sixty_per_second():
+    paths = simulate_balls((0, 0, 1000), (9000, 0, 0), 1.0)
+
+    assert np.linalg.norm(paths.velocities[0, 0]) == pytest.approx(BALL_MAX_SPEED)
+    assert len(paths.times) == 61
+    assert paths.times[1] == pytest.approx(1 / 60)
@@ -0,0 +1,53 @@
+import math
+import random
+
+import pytest
+
+from util.drive import DubinsPath, angle_difference
+from util.vec import Vec3
+
+
+def random_path(rng: random.Random):
+    start = Vec3(rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), 17)
+    target = Vec3(rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), 17)
+    return start, rng.uniform(-math.pi, math.pi), target, rng.uniform(-math.pi, math.pi), rng.uniform(0, 2300)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_path_reaches_target_at_required_heading(seed):
+    start, start_heading, target, heading, speed = random_path(random.Random(seed))
+    path = DubinsPath(start, start_heading, target, heading, speed)
+
+    end = path.point_at(path.length)
+    before = path.point_at(path.length - 0.01)
+    assert end.flat_dist(target) == pytest.approx(0, abs=1e-6)
+    assert angle_difference(math.atan2(end.y - before.y, end.x - before.x), heading) == pytest.approx(0, abs=1e-3)
+    assert path.point_at(0).flat_dist(start) == pytest.approx(0, abs=1e-6)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_path_parts_add_up_to_its_length(seed):
+    path = DubinsPath(*random_path(random.Random(seed)))
+    assert all(0 <= arc < 2 * math.pi for arc in path.arcs)
+    assert path.radius * sum(path.arcs) + path.straight == pytest.approx(path.length)
+
+
+@pytest.mark.parametrize('seed', range(500))
+def test_path_straight_ahead_is_as_long_as_the_distance(seed):
+    rng = random.Random(seed)
+    start = Vec3(rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), 17)
+    heading = rng.uniform(-math.pi, math.pi)
+    distance = rng.uniform(100, 3000)
+    target = Vec3(start.x + distance * math.cos(heading), start.y + distance * math.sin(heading), 17)
+
+    path = DubinsPath(start, heading, target, heading, rng.uniform(0, 2300))
+
+    assert path.length == pytest.approx(distance)
+    assert path.arcs == pytest.approx((0, 0), abs=1e-9)
+
+
+def test_example_of_a_lined_up_car_does_not_loop():
+    heading = 0.9304
+    start = Vec3(-2228.9, -1221.7, 17)
+    target = Vec3(start.x + 1235 * math.cos(heading), start.y + 1235 * math.sin(heading), 17)
+    assert DubinsPath(start, heading, target, heading, 1400).length == pytest.approx(1235)
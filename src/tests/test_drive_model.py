@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+import pytest
+
+from util.drive_model import MAX_DISTANCE, MAX_SPEED, DriveTimeTable, turn_path_length
+
+
+@pytest.fixture(scope='module')
+def table():
+    return DriveTimeTable()
+
+
+@pytest.mark.parametrize('speed', [0, 1000, 1300, 1400, 1800, MAX_SPEED])
+@pytest.mark.parametrize('distance', [100, 1000, 3000])
+def test_target_dead_ahead_needs_no_turn(speed, distance):
+    assert turn_path_length(speed, distance, 0.0) == pytest.approx(distance)
+
+
+def test_times_grow_with_distance_and_angle_on_the_grid(table):
+    assert np.all(np.diff(table.times, axis=1) >= 0)
+    assert np.all(np.diff(table.times, axis=2) >= 0)
+
+
+def test_time_to_reach_grows_with_distance_and_angle_between_grid_points(table):
+    rng = np.random.default_rng(0)
+    speed = rng.uniform(0, MAX_SPEED, (200, 1))
+    boost = rng.uniform(0, 100, (200, 1))
+    angle = rng.uniform(-math.pi, math.pi, (200, 1))
+    distance = rng.uniform(0, MAX_DISTANCE, (200, 1))
+    by_distance = table.time_to_reach(speed, np.linspace(0, MAX_DISTANCE * 1.2, 97), angle, boost)
+    by_angle = table.time_to_reach(speed, distance, np.linspace(0, math.pi, 97), boost)
+    assert np.all(np.diff(by_distance, axis=1) >= 0)
+    assert np.all(np.diff(by_angle, axis=1) >= 0)
+    assert table.time_to_reach(1300.0, 100.0, 0.0, 0.0) < 0.2
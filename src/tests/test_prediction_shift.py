@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+
+from util.ball_simulator import simulate_balls
+from util.bounds_pyramid import prediction_channels, shift_channels
+from util.prediction_arrays import PredictionArrays
+from util.prediction_cache import SUMMARY_SCAN, PredictionCache
+from util.prediction_events import PredictionEvents
+
+NUM_SLICES = 360
+
+# Balls that bounce off the floor, walls and ceiling within the prediction, and one that goes in.
+STARTS = [
+    ((0, 0, 1200), (1800, 600, 300)),
+    ((-3000, 2000, 300), (-1500, 1200, 1500)),
+    ((1000, -3000, 150), (300, -2000, 400)),
+    ((2500, 4000, 93), (-1000, 300, 0)),
+    ((-2000, 0, 500), (600, 1500, 600)),
+]
+
+
+def _paths(location, velocity):
+    # Long enough for the last window below.
+    return simulate_balls(location, velocity, (2 * NUM_SLICES + 1) / 60)
+
+
+def _fill(ball_prediction: BallPrediction, paths, first: int, start_time: float):
+    # Slices first + 1 onwards of the simulated path, as the game would fill the struct in place.
+    ball_prediction.num_slices = NUM_SLICES
+    for i in range(NUM_SLICES):
+        physics = ball_prediction.slices[i].physics
+        physics.location.x, physics.location.y, physics.location.z = paths.locations[0, first + i + 1].tolist()
+        physics.velocity.x, physics.velocity.y, physics.velocity.z = paths.velocities[0, first + i + 1].tolist()
+        ball_prediction.slices[i].game_seconds = start_time + (first + i + 1) / 60
+    return ball_prediction
+
+
+def _window(paths, first: int, start_time=100.0) -> PredictionArrays:
+    return PredictionArrays(_fill(BallPrediction(), paths, first, start_time))
+
+
+def assert_same_events(shifted: PredictionEvents, fresh: PredictionEvents):
+    assert [(e.kind, e.index, e.time) for e in shifted.events] == [(e.kind, e.index, e.time) for e in fresh.events]
+    for a, b in zip(shifted.events, fresh.events):
+        assert (a.location.x, a.location.y, a.location.z) == (b.location.x, b.location.y, b.location.z)
+        assert (a.velocity.x, a.velocity.y, a.velocity.z) == (b.velocity.x, b.velocity.y, b.velocity.z)
+    np.testing.assert_array_equal(shifted._contact, fresh._contact)
+    np.testing.assert_array_equal(shifted.segment_of_slice, fresh.segment_of_slice)
+    np.testing.assert_array_equal(shifted.segment_starts, fresh.segment_starts)
+    np.testing.assert_array_equal(shifted.segment_ends, fresh.segment_ends)
+
+
+@pytest.mark.parametrize('start', STARTS)
+@pytest.mark.parametrize('shift', [1, 2, 7, 60, 200])
+def test_shifted_results_match_a_fresh_computation(start, shift):
+    paths = _paths(*start)
+    before = _window(paths, 0)
+    after = _window(paths, shift)
+    events = PredictionEvents(before)
+    assert events.events, 'the ball should hit something'
+
+    assert_same_events(events.shifted(after, shift), PredictionEvents(after))
+
+    channels = prediction_channels(after)
+    np.testing.assert_array_equal(shift_channels(prediction_channels(before), after, shift), channels)
+
+    answers = SUMMARY_SCAN.shifted(SUMMARY_SCAN.run(prediction_channels(before), before.locations), shift, channels)
+    if answers is not None:
+        assert answers == SUMMARY_SCAN.run(channels, after.locations)
+
+
+@pytest.mark.parametrize('start_time', [10.0, 1500.0, 5000.0])
+@pytest.mark.parametrize('start', STARTS)
+def test_cache_reuses_shifted_results_late_in_the_game(start_time, start):
+    paths = _paths(*start)
+    ball_prediction = BallPrediction()
+    agent = SimpleNamespace(get_ball_prediction_struct=lambda: ball_prediction)
+    packet = SimpleNamespace(game_info=SimpleNamespace(frame_num=0),
+                             game_ball=SimpleNamespace(latest_touch=SimpleNamespace(time_seconds=0.0)))
+    cache = PredictionCache()
+    for first in range(0, 240, 2):
+        packet.game_info.frame_num = first
+        _fill(ball_prediction, paths, first, start_time)
+        cache.update(agent, packet)
+        events = cache.events()
+        channels = cache.channels()
+        answers = cache.scan(SUMMARY_SCAN)
+        if first > 0:
+            assert cache.shift == 2
+        fresh = PredictionEvents(cache.prediction)
+        assert_same_events(events, fresh)
+        np.testing.assert_array_equal(channels, prediction_channels(cache.prediction))
+        assert answers == SUMMARY_SCAN.run(channels, cache.prediction.locations)
+    assert cache.reuses > 0
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+from rlbot.agents.base_agent import SimpleControllerState
+
+from util.sequence import ControlStep, Sequence
+
+
+def packet(time):
+    return SimpleNamespace(game_info=SimpleNamespace(seconds_elapsed=time))
+
+
+def front_flip_steps():
+    return [
+        ControlStep(duration=0.05, controls=SimpleControllerState(jump=True, pitch=0)),
+        ControlStep(duration=0.05, controls=SimpleControllerState(jump=False, pitch=0)),
+        ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1)),
+        ControlStep(duration=0.8, controls=SimpleControllerState(pitch=0)),
+    ]
+
+
+def step_indices(steps, outputs):
+    return [next((i for i, step in enumerate(steps) if step.controls is controls), None) for controls in outputs]
+
+
+def run_step_by_step(steps, times):
+    """Ticks each ControlStep on its own, the way a sequence of them behaved before they were compiled."""
+    index = 0
+    outputs = []
+    for time in times:
+        if index >= len(steps):
+            outputs.append(None)
+            continue
+        result = steps[index].tick(packet(time))
+        outputs.append(index)
+        if result.done:
+            index += 1
+    return outputs
+
+
+FRAMES = [
+    [i / 120 for i in range(200)],
+    [i / 60 for i in range(100)],
+    # Frame hitches longer than the short steps.
+    [0.0, 1 / 120, 0.2, 0.2 + 1 / 120, 0.5, 0.51, 0.52, 1.5, 1.51, 1.6, 2.0],
+    [0.0, 0.3, 0.31, 0.62, 0.63, 1.7, 1.71, 2.9, 3.0],
+]
+
+
+@pytest.mark.parametrize('times', FRAMES)
+def test_sequence_matches_ticking_each_step(times):
+    steps = front_flip_steps()
+    sequence = Sequence(steps)
+    outputs = [None if sequence.done else sequence.tick(packet(time)) for time in times]
+    assert step_indices(steps, outputs) == run_step_by_step(front_flip_steps(), times)
+
+
+def test_hitch_does_not_skip_short_steps():
+    steps = front_flip_steps()
+    sequence = Sequence(steps)
+    outputs = [sequence.tick(packet(time)) for time in [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0]]
+    assert step_indices(steps, outputs) == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert sequence.done
@@ -0,0 +1,134 @@
+import numpy as np
+
+from util.drive_model import BOOST_PER_SECOND
+from util.grid_lookup import interpolate
+from util.table_cache import load_or_build
+
+# Air physics for a standard car, see https://samuelpmish.github.io/notes/RocketLeague/aerial_control/
+GRAVITY = 650
+AIR_BOOST_ACCELERATION = 1058.333
+JUMP_SPEED = 291.667
+JUMP_HOLD_ACCELERATION = 1458.333
+JUMP_HOLD_TIME = 0.2
+
+# We can't point the car perfectly, so only count on this fraction of the boost acceleration.
+USABLE_BOOST_FRACTION = 0.85
+
+# Table grids: horizontal distance, height above the car, and the car's current vertical velocity.
+DISTANCE_STEP = 100
+MAX_DISTANCE = 5000
+HEIGHT_STEP = 50
+MAX_HEIGHT = 2000
+VERTICAL_SPEED_STEP = 100
+MAX_VERTICAL_SPEED = 1000  # the grid runs from -MAX_VERTICAL_SPEED to MAX_VERTICAL_SPEED
+
+# Arrival times we try, in seconds.
+TIME_STEP = 1 / 60
+MAX_TIME = 4.0
+
+# What unreachable cells hold. They are finite so interpolation next to them stays well behaved.
+UNREACHABLE_TIME = 10.0
+UNREACHABLE_BOOST = 1000.0
+
+# Bump this when _build() changes in a way the constants above don't capture, so cached tables get rebuilt.
+TABLE_VERSION = 1
+
+
+class AerialEnvelope:
+    """
+    Precomputed aerial reachability. For every (horizontal distance, height, current vertical velocity) cell it stores
+    the earliest time we can get there by boosting, and the least boost any feasible arrival time costs.
+
+    The model is the usual one for aerial planning: with a constant boost direction the car's position after T
+    seconds is its free ballistic path plus 0.5 * a * T^2, so reaching a point at time T needs a fixed acceleration
+    a, which is feasible when |a| fits within what boost gives us. Boost is feathered to exactly that. Horizontal
+    velocity isn't an axis: measure the horizontal distance from where the car would drift to by the arrival time.
+
+    With with_jump the car starts with a full jump (impulse plus holding jump), which is the grounded takeoff case.
+    """
+
+    def __init__(self, with_jump: bool, earliest_time: np.ndarray = None, min_boost: np.ndarray = None):
+        self.with_jump = with_jump
+        self.distances = np.arange(0, MAX_DISTANCE + DISTANCE_STEP, DISTANCE_STEP, dtype=float)
+        self.heights = np.arange(0, MAX_HEIGHT + HEIGHT_STEP, HEIGHT_STEP, dtype=float)
+        self.vertical_speeds = np.arange(-MAX_VERTICAL_SPEED, MAX_VERTICAL_SPEED + VERTICAL_SPEED_STEP,
+                                         VERTICAL_SPEED_STEP, dtype=float)
+        if earliest_time is None or min_boost is None:
+            earliest_time, min_boost = self._build()
+        # Both indexed [distance, height, vertical_speed]
+        self.earliest_time = earliest_time
+        self.min_boost = min_boost
+
+    def _build(self):
+        times = np.arange(TIME_STEP, MAX_TIME + TIME_STEP / 2, TIME_STEP)
+        shape = (len(self.distances), len(self.heights), len(self.vertical_speeds))
+        earliest_time = np.full(shape, UNREACHABLE_TIME, dtype=np.float32)
+        min_boost = np.full(shape, UNREACHABLE_BOOST, dtype=np.float32)
+
+        t = times[None, None, :]
+        distance = self.distances[:, None, None]
+        height = self.heights[None, :, None]
+        rise = np.zeros_like(times)
+        if self.with_jump:
+            hold = np.minimum(times, JUMP_HOLD_TIME)
+            rise = JUMP_SPEED * times + JUMP_HOLD_ACCELERATION * hold * (times - hold / 2)
+
+        for k, vertical_speed in enumerate(self.vertical_speeds):
+            free_height = vertical_speed * times - 0.5 * GRAVITY * times ** 2 + rise
+            accel_h = 2 * distance / t ** 2
+            accel_z = 2 * (height - free_height[None, None, :]) / t ** 2
+            accel = np.hypot(accel_h, accel_z)
+            feasible = accel <= AIR_BOOST_ACCELERATION * USABLE_BOOST_FRACTION
+            boost = np.where(feasible, accel / AIR_BOOST_ACCELERATION * t * BOOST_PER_SECOND, np.inf)
+
+            any_feasible = feasible.any(axis=-1)
+            first = np.argmax(feasible, axis=-1)
+            earliest_time[:, :, k] = np.where(any_feasible, times[first], UNREACHABLE_TIME)
+            min_boost[:, :, k] = np.where(any_feasible, boost.min(axis=-1), UNREACHABLE_BOOST)
+        return earliest_time, min_boost
+
+    def lookup(self, distance, height, vertical_speed):
+        """
+        Returns (earliest_time, min_boost) for arrays of targets, interpolated between grid points. Heights below
+        the car count as zero and everything is clamped to the table's range.
+        """
+        position = np.stack(np.broadcast_arrays(
+            np.asarray(distance, dtype=float) / DISTANCE_STEP,
+            np.asarray(height, dtype=float) / HEIGHT_STEP,
+            (np.asarray(vertical_speed, dtype=float) + MAX_VERTICAL_SPEED) / VERTICAL_SPEED_STEP,
+        ), axis=-1)
+        return interpolate(self.earliest_time, position), interpolate(self.min_boost, position)
+
+
+_default_envelopes = {}
+
+
+def default_aerial_envelope(with_jump: bool) -> AerialEnvelope:
+    """
+    The shared AerialEnvelope for grounded (with_jump) or airborne takeoffs. The first call maps it from the on-disk
+    table cache, building and saving it only if no envelope was built from the current constants yet.
+    """
+    if with_jump not in _default_envelopes:
+        def build():
+            envelope = AerialEnvelope(with_jump)
+            return {'earliest_time': envelope.earliest_time, 'min_boost': envelope.min_boost}
+
+        name = 'aerial_envelope_jump' if with_jump else 'aerial_envelope'
+        arrays = load_or_build(name, table_parameters(), build)
+        _default_envelopes[with_jump] = AerialEnvelope(with_jump, arrays['earliest_time'], arrays['min_boost'])
+    return _default_envelopes[with_jump]
+
+
+def table_parameters() -> dict:
+    """Everything the envelopes are built from. A change to any of it invalidates cached envelopes."""
+    return {
+        'version': TABLE_VERSION,
+        'gravity': GRAVITY,
+        'air_boost_acceleration': AIR_BOOST_ACCELERATION,
+        'boost_per_second': BOOST_PER_SECOND,
+        'jump': [JUMP_SPEED, JUMP_HOLD_ACCELERATION, JUMP_HOLD_TIME],
+        'usable_boost_fraction': USABLE_BOOST_FRACTION,
+        'grid': [DISTANCE_STEP, MAX_DISTANCE, HEIGHT_STEP, MAX_HEIGHT, VERTICAL_SPEED_STEP, MAX_VERTICAL_SPEED],
+        'time': [TIME_STEP, MAX_TIME],
+        'unreachable': [UNREACHABLE_TIME, UNREACHABLE_BOOST],
+    }
@@ -1,21 +1,17 @@
-from util.vec import Vec3
-from rlbot.utils.structures.game_data_struct import GameTickPacket
+from util.tick_context import TickContext
 
-def get_ball_state(packet: GameTickPacket, car_index: int):
+def get_ball_state(ctx: TickContext):
     """
     Analyzes the ball's state relative to the car for dribbling decisions.
     Returns a dict with useful ball state information.
     """
-    ball = packet.game_ball.physics
-    car = packet.game_cars[car_index].physics
-    
-    ball_loc = Vec3(ball.location)
-    car_loc = Vec3(car.location)
-    ball_vel = Vec3(ball.velocity)
-    car_vel = Vec3(car.velocity)
+    ball_loc = ctx.ball_location
+    car_loc = ctx.car.location
+    ball_vel = ctx.ball_velocity
+    car_vel = ctx.car.velocity
     
     relative_vel = ball_vel - car_vel
-    distance = ball_loc.dist(car_loc)
+    distance = ctx.dist_to_ball
     
     # Calculate if ball is on car roof
     ball_height = ball_loc.z - car_loc.z
@@ -15,6 +15,7 @@ def find_slice_at_time(ball_prediction: BallPrediction, game_time: float):
     """
     This will find the future position of the ball at the specified time. The returned
     Slice object will also include the ball's velocity, etc.
+    Rounds down to a slice. PredictionArrays.sample interpolates between slices, for many times at once.
     """
     start_time = ball_prediction.slices[0].game_seconds
     approx_index = int((game_time - start_time) * 60)  # We know that there are 60 slices per second.
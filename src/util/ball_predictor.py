@@ -1,46 +1,286 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from rlbot.utils.structures.ball_prediction_struct import Slice
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.drive_model import default_drive_table
+from util.prediction_arrays import PredictionArrays, first_index
+from util.prediction_events import BALL_DRAG, GRAVITY, PredictionEvents
 from util.vec import Vec3
-from util.ball_prediction_analysis import find_slice_at_time
+
+# All of these take the per-tick PredictionArrays rather than the raw BallPrediction, and answer with one vectorized
+# mask over every slice. They still return the raw Slice (or None) so callers don't need to change.
 
 # Helper to find the soonest ground touch in the ball prediction
 
-def find_next_ground_touch(ball_prediction):
-    for i in range(ball_prediction.num_slices):
-        slice = ball_prediction.slices[i]
-        if slice.physics.location.z < 150 and abs(slice.physics.velocity.z) < 100:
-            return slice
-    return None
+def find_next_ground_touch(prediction: PredictionArrays):
+    mask = (prediction.locations[:, 2] < 150) & (abs(prediction.velocities[:, 2]) < 100)
+    return prediction.first_slice(mask)
 
 # Helper to find the best intercept slice for a car
 
-def find_best_intercept(car_location, car_speed, ball_prediction, max_time=3.0, min_height=0, max_height=300):
-    best_slice = None
-    best_time = None
-    for i in range(ball_prediction.num_slices):
-        slice = ball_prediction.slices[i]
-        t = slice.game_seconds
-        ball_loc = Vec3(slice.physics.location)
-        if min_height <= ball_loc.z <= max_height:
-            time_to_ball = t
-            dist = car_location.dist(ball_loc)
-            # Estimate time to reach ball (very simple, can be improved)
-            time_needed = dist / max(car_speed, 400)
-            if time_needed < (t - ball_prediction.slices[0].game_seconds) + 0.2:
-                best_slice = slice
-                best_time = t
-                break
-    return best_slice
+def find_best_intercept(car_location, car_speed, prediction: PredictionArrays, max_time=3.0, min_height=0, max_height=300,
+                        events: PredictionEvents = None):
+    # Solved on the ball's arcs (see solve_arc_intercept), then rounded up to the first slice at or after that time.
+    # Pass the prediction's events if you have them (PredictionCache.events()) to skip segmenting it again.
+    if prediction.num_slices == 0:
+        return None
+    intercept = solve_arc_intercept(car_location, car_speed, prediction, events or PredictionEvents(prediction),
+                                    min_height, max_height)
+    if intercept is None:
+        return None
+    return prediction.slice(intercept.index)
 
 # Helper to find a shot opportunity (ball moving toward opponent goal)
-def find_shot_opportunity(ball_prediction, opponent_goal_y, min_speed=400):
-    for i in range(ball_prediction.num_slices):
-        slice = ball_prediction.slices[i]
-        ball_loc = Vec3(slice.physics.location)
-        ball_vel = Vec3(slice.physics.velocity)
-        # Check if ball is moving toward opponent goal
-        if (opponent_goal_y > 0 and ball_vel.y > min_speed) or (opponent_goal_y < 0 and ball_vel.y < -min_speed):
-            if ball_loc.z < 300:
-                return slice
-    return None
+def find_shot_opportunity(prediction: PredictionArrays, opponent_goal_y, min_speed=400):
+    ball_vy = prediction.velocities[:, 1]
+    # Check if ball is moving toward opponent goal
+    if opponent_goal_y > 0:
+        mask = ball_vy > min_speed
+    elif opponent_goal_y < 0:
+        mask = ball_vy < -min_speed
+    else:
+        return None
+    mask &= prediction.locations[:, 2] < 300
+    return prediction.first_slice(mask)
+
+# Helper to find the first slice where the ball is inside either goal (standard arenas only)
+def find_future_goal(prediction: PredictionArrays):
+    return prediction.first_slice(abs(prediction.locations[:, 1]) >= GOAL_THRESHOLD)
+
+# Height bands for solve_intercepts, as (min_height, max_height)
+GROUND_BAND = (0, 300)
+AERIAL_BAND = (300, 1000)
+HIGH_BAND = (1000, 2100)
+
+# An intercept still counts if we arrive up to this many seconds after the ball does (same as find_best_intercept).
+INTERCEPT_GRACE = 0.2
+
+# The game's physics tick. Ball prediction slices are two of these apart.
+PHYSICS_DT = 1 / 120
+# How far (uu) the arcs of solve_arc_intercept may be off before a root is rejected without checking it against the
+# prediction, and how many times that check tries between the slices around the root.
+ARC_TOLERANCE = 5.0
+REFINE_STEPS = 33
+
+@dataclass
+class Intercept:
+    slice: Slice
+    index: int
+    time: float  # game_seconds of the slice
+    slack: float  # ball arrival minus our arrival, in seconds. Can dip to -INTERCEPT_GRACE.
+
+def solve_intercepts(car_location, car_speed, prediction: PredictionArrays, bands: Sequence[Tuple[float, float]],
+                     max_time: float = None, search_increment=8, car_forward=None, boost=0) -> List[Optional[Intercept]]:
+    """
+    Finds the earliest slice we can reach in each height band. Returns one Intercept (or None) per band, in order.
+
+    By default this uses the same constant-speed travel estimate as find_best_intercept. Pass car_forward (and boost)
+    to use the drive-time table instead, which accounts for acceleration and the turn needed to face the ball.
+
+    The coarse pass checks every search_increment-th slice (plus the last one) to find how far the search has to go:
+    nothing after the first passing check can be the answer. A short window (a ball dipping through a band, or a
+    slack that only briefly turns positive) can fall between two failing checks, so every slice up to there is then
+    measured in one vectorized pass, which finds the same slice as checking them one by one.
+    """
+    num_slices = prediction.num_slices
+    if max_time is not None and num_slices > 0:
+        # Slice times are sorted, so the horizon can be found by bisection too.
+        num_slices = int(np.searchsorted(prediction.times, prediction.times[0] + max_time, side='right'))
+    if num_slices == 0:
+        return [None] * len(bands)
+
+    times = prediction.times
+    locations = prediction.locations
+    car = np.array((car_location.x, car_location.y, car_location.z))
+    speed = max(car_speed, 400)
+    start_time = float(times[0])
+    drive_table = default_drive_table() if car_forward is not None else None
+
+    def travel_times(offset):
+        # offset is (M, 3): ball location minus car location
+        if drive_table is None:
+            return np.sqrt(np.einsum('ij,ij->i', offset, offset)) / speed
+        angle = np.arctan2(car_forward.x * offset[:, 1] - car_forward.y * offset[:, 0],
+                           car_forward.x * offset[:, 0] + car_forward.y * offset[:, 1])
+        return drive_table.time_to_reach(car_speed, np.hypot(offset[:, 0], offset[:, 1]), angle, boost)
+
+    # Plain strided slices are views, so the coarse pass copies nothing until the arithmetic.
+    last = num_slices - 1
+    coarse = list(range(0, num_slices, search_increment))
+    if coarse[-1] != last:
+        coarse.append(last)
+    coarse_locations = locations[:num_slices:search_increment]
+    coarse_times = times[:num_slices:search_increment]
+    if len(coarse) > len(coarse_times):
+        coarse_locations = np.vstack((coarse_locations, locations[last]))
+        coarse_times = np.append(coarse_times, times[last])
+    coarse_slack = (coarse_times - start_time) - travel_times(coarse_locations - car)
+    coarse_z = coarse_locations[:, 2]
+    coarse_reachable = coarse_slack > -INTERCEPT_GRACE
+
+    # How many slices the fine pass needs: up to each band's first passing check, or all of them if a band has none.
+    firsts = [first_index(coarse_reachable & (min_height <= coarse_z) & (coarse_z <= max_height))
+              for min_height, max_height in bands]
+    end = num_slices if -1 in firsts else max((coarse[c] for c in firsts), default=-1) + 1
+    slack = (times[:end] - start_time) - travel_times(locations[:end] - car)
+    z = locations[:end, 2]
+    reachable = slack > -INTERCEPT_GRACE
+
+    results = []
+    for min_height, max_height in bands:
+        i = first_index(reachable & (min_height <= z) & (z <= max_height))
+        if i < 0:
+            results.append(None)
+            continue
+        results.append(Intercept(prediction.slice(i), i, float(times[i]), float(slack[i])))
+    return results
+
+@dataclass
+class ArcIntercept:
+    time: float  # game_seconds, not rounded to a slice
+    index: int  # first slice at or after time
+    location: Vec3
+    velocity: Vec3
+
+def solve_arc_intercept(car_location, car_speed, prediction: PredictionArrays, events: PredictionEvents, min_height=0,
+                        max_height=300, grace=INTERCEPT_GRACE) -> Optional[ArcIntercept]:
+    """
+    Finds the earliest moment the ball is between min_height and max_height and a car driving straight at
+    max(car_speed, 400) could be there, arriving at most grace seconds late. Same question as find_best_intercept
+    always asked, but answered in continuous time.
+
+    Between contacts the ball flies under gravity and drag. On each free-flight segment from events its offset from
+    the car is close to a quartic in time (the Taylor series of that flight, within about a unit over five seconds),
+    so 'distance to ball <= speed * (time + grace)' is a polynomial inequality and the height band two more. The
+    earliest feasible time is the segment start or one of their roots. Slices inside contacts (a
+    rolling ball) are checked one by one, and that check also tells us which segments can't hold anything earlier,
+    so usually only one or two arcs are solved.
+
+    The arcs follow the game's own integrator (semi-implicit Euler at PHYSICS_DT), so they line up with the slices.
+    A root only says where to look: the answer is the first time around it at which the prediction itself
+    (PredictionArrays.sample()) passes the same slack test the slices get, and it is never later than the first
+    slice that passes.
+    """
+    num_slices = prediction.num_slices
+    if num_slices == 0:
+        return None
+    times = prediction.times
+    locations = prediction.locations
+    velocities = prediction.velocities
+    car = np.array((car_location.x, car_location.y, car_location.z))
+    speed = max(car_speed, 400)
+    start_time = float(times[0])
+
+    # Slice by slice first. The first passing slice bounds the answer, so arcs after it needn't be solved.
+    ball_z = locations[:, 2]
+    offset = locations - car
+    distance = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+    slack = speed * (times - start_time + grace) - distance
+    in_band = (min_height <= ball_z) & (ball_z <= max_height)
+    bound = first_index(in_band & (slack >= 0))
+    last_segment = events.segment_of_slice[bound] if bound >= 0 else len(events.segment_starts) - 1
+    starts = events.segment_starts[:last_segment + 1]
+    ends = events.segment_ends[:last_segment + 1]
+
+    # Between two slices the slack and height can't stray further than these from the slices' own values, so an arc
+    # whose slices all miss by more can't have a window in between. That skips most arcs without solving them.
+    step = float(np.max(np.diff(times))) if num_slices > 1 else 0.0
+    ball_speed = float(np.sqrt(np.max(np.einsum('ij,ij->i', velocities, velocities))))
+    slack_margin = (speed + ball_speed) * step / 2
+    z_margin = ball_speed * step / 2
+    worth_solving = ((ends > starts)
+                     & (np.maximum.reduceat(slack, starts) >= -slack_margin)
+                     & (np.maximum.reduceat(ball_z, starts) >= min_height - z_margin)
+                     & (np.minimum.reduceat(ball_z, starts) <= max_height + z_margin))
+
+    for first, last in zip(starts[worth_solving].tolist(), ends[worth_solving].tolist()):
+        t0 = float(times[first])
+        h = t0 - start_time + grace
+        # Each axis of the offset as a quartic in tau, highest power first: the Taylor series of flight under
+        # gravity and drag, where every derivative past the velocity is -BALL_DRAG times the one before (plus gravity
+        # in the acceleration). Semi-implicit Euler moves the ball as if it had started half a physics step later.
+        axes = []
+        for p0, v0, g in zip(offset[first].tolist(), velocities[first].tolist(), (0.0, 0.0, GRAVITY)):
+            u = v0 + 0.5 * (g - BALL_DRAG * v0) * PHYSICS_DT
+            a2 = g - BALL_DRAG * u
+            a3 = -BALL_DRAG * a2
+            axes.append(np.array((-BALL_DRAG * a3 / 24, a3 / 6, a2 / 2, u, p0)))
+        # |offset(tau)|^2 - speed^2 * (tau + h)^2
+        reach = sum(np.convolve(axis, axis) for axis in axes)
+        reach[-3:] -= speed ** 2 * np.array((1, 2 * h, h * h))
+        heights = axes[2].copy()
+        heights[-1] += car[2]
+        duration = float(times[last]) - t0
+        candidates = [0.0] + _real_roots(reach, duration)
+        # The band's edges only matter if the ball can cross one during the segment.
+        segment_z = ball_z[first:last + 1]
+        for height in (min_height, max_height):
+            if segment_z.min() - z_margin <= height <= segment_z.max() + z_margin:
+                heights[-1] -= height
+                candidates += _real_roots(heights, duration)
+                heights[-1] += height
+        x_axis, y_axis, z_axis = (axis.tolist() for axis in axes)
+
+        found = None
+        for tau in sorted(candidates):
+            # Cheap test on the arc first. It can be a few units off, so it only filters.
+            x = _horner(x_axis, tau)
+            y = _horner(y_axis, tau)
+            z = _horner(z_axis, tau)
+            if speed * (tau + h) - math.sqrt(x * x + y * y + z * z) < -ARC_TOLERANCE \
+                    or not min_height - ARC_TOLERANCE <= z + car[2] <= max_height + ARC_TOLERANCE:
+                continue
+            found = _first_feasible(prediction, car, speed, start_time - grace, min_height, max_height,
+                                    max(first, int(np.searchsorted(times, t0 + tau, side='right')) - 1))
+            if found is not None:
+                break
+        if found is None:
+            continue
+        time, location, velocity = found
+        if bound >= 0 and time >= times[bound]:
+            # The slice check already found something as soon.
+            break
+        index = min(int(np.searchsorted(times, time - 1e-6)), num_slices - 1)
+        return ArcIntercept(time, index, Vec3.from_xyz(*location), Vec3.from_xyz(*velocity))
+
+    if bound < 0:
+        return None
+    return ArcIntercept(float(times[bound]), bound, Vec3(*locations[bound].tolist()), Vec3(*velocities[bound].tolist()))
+
+def _first_feasible(prediction: PredictionArrays, car: np.ndarray, speed: float, reference_time: float,
+                    min_height: float, max_height: float, index: int):
+    # The first time between slice index and the next one at which the prediction itself passes the slack and height
+    # tests, as (time, location, velocity), or None. Tries REFINE_STEPS evenly spaced times.
+    times = prediction.times
+    end = float(times[min(index + 1, prediction.num_slices - 1)])
+    candidate_times = np.linspace(float(times[index]), end, REFINE_STEPS)
+    locations, velocities = prediction.sample(candidate_times)
+    offsets = locations - car
+    slack = speed * (candidate_times - reference_time) - np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+    heights = locations[:, 2]
+    i = first_index((slack >= 0) & (min_height <= heights) & (heights <= max_height))
+    if i < 0:
+        return None
+    return float(candidate_times[i]), locations[i].tolist(), velocities[i].tolist()
+
+def _real_roots(coefficients: np.ndarray, high: float) -> List[float]:
+    # Real roots in (0, high] of the polynomial with these coefficients (highest power first, leading one nonzero),
+    # from the eigenvalues of its companion matrix like np.roots, without its checks and trimming.
+    degree = len(coefficients) - 1
+    companion = np.eye(degree, k=-1)
+    companion[0] = -coefficients[1:] / coefficients[0]
+    return [root.real for root in np.linalg.eigvals(companion).tolist()
+            if abs(root.imag) < 1e-9 and 0 < root.real <= high]
+
+def _horner(coefficients, x):
+    result = 0.0
+    for coefficient in coefficients:
+        result = result * x + coefficient
+    return result
 
 def predict_car_position(car_location, car_velocity, car_forward, dt, use_forward_only=False):
     """
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.prediction_events import BALL_DRAG, GRAVITY
+
+# Standard arena (Soccar), in uu. The curved ramps where the walls meet the floor and ceiling aren't modelled, so a
+# ball rolling into a wall stops there instead of riding up it.
+BALL_RADIUS = 92.75
+BALL_MAX_SPEED = 6000
+SIDE_WALL = 4096
+BACK_WALL = 5120
+CEILING = 2044
+# The 45 degree corner walls are the planes |x| + |y| = CORNER_OFFSET.
+CORNER_OFFSET = 8064
+GOAL_HALF_WIDTH = 892.755
+GOAL_HEIGHT = 642.775
+
+# Share of the velocity into a surface the ball keeps, bouncing back out. There is no spin, so the velocity along
+# the surface is kept as it is.
+RESTITUTION = 0.6
+
+# The game's physics tick.
+PHYSICS_DT = 1 / 120
+
+# The surfaces besides the floor as planes n . p = offset with n pointing into the arena, already moved in by the
+# ball's radius so they test the ball's centre. Rows: ceiling, the two side walls, the two back walls, then the four
+# corners. The floor is handled on its own since a rolling ball touches it every step.
+_NORMALS = np.array([
+    (0, 0, -1),
+    (1, 0, 0), (-1, 0, 0),
+    (0, 1, 0), (0, -1, 0),
+    (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+], dtype=float)
+_NORMALS[5:] /= np.sqrt(2)
+_OFFSETS = BALL_RADIUS - np.array([CEILING, SIDE_WALL, SIDE_WALL, BACK_WALL, BACK_WALL] +
+                                   [CORNER_OFFSET / np.sqrt(2)] * 4)
+_BACK_WALLS = slice(3, 5)
+
+
+@dataclass
+class BallPaths:
+    """
+    The simulated paths of a batch of balls. Index [ball, sample]; sample k is at times[k] seconds from the start,
+    and sample 0 is the starting state.
+    """
+    times: np.ndarray  # (S,)
+    locations: np.ndarray  # (M, S, 3)
+    velocities: np.ndarray  # (M, S, 3)
+    goal_times: np.ndarray  # (M,) seconds until the ball is in a goal, or inf if it never is in time
+    goal_sides: np.ndarray  # (M,) sign of y of the goal it goes in (1 is orange's goal, -1 blue's), 0 if none
+
+
+def simulate_balls(locations, velocities, duration: float, dt: float = PHYSICS_DT, record_every: int = 2) -> BallPaths:
+    """
+    Simulates many balls at once from their starting locations and velocities ((M, 3) each, or (3,) for one ball),
+    for duration seconds. Use it for states the game's BallPrediction doesn't cover: what the ball does after a touch
+    we're only considering, or further out than the prediction goes.
+
+    Each step is the game's semi-implicit Euler step with gravity and drag, then a bounce off whichever surface the
+    ball has gone furthest into, and off the floor. The back walls are open inside the goal mouths, and a ball that
+    gets GOAL_THRESHOLD deep is scored and stops there. Samples are kept every record_every steps, which is 60 per
+    second like the BallPrediction at the default dt. A bigger dt is cheaper and coarser, which is fine for comparing
+    outcomes.
+    """
+    locations = np.array(locations, dtype=float).reshape(-1, 3)
+    velocities = np.array(velocities, dtype=float).reshape(-1, 3)
+    speed = np.sqrt(np.einsum('ij,ij->i', velocities, velocities))[:, None]
+    velocities *= np.minimum(1, BALL_MAX_SPEED / np.maximum(speed, 1e-9))
+
+    count = len(locations)
+    steps = max(int(round(duration / dt)), 0)
+    samples = steps // record_every + 1
+    recorded_locations = np.empty((count, samples, 3))
+    recorded_velocities = np.empty((count, samples, 3))
+    recorded_locations[:, 0] = locations
+    recorded_velocities[:, 0] = velocities
+    goal_times = np.full(count, np.inf)
+    goal_sides = np.zeros(count, dtype=int)
+
+    # Scored balls stop where they are. fall is per ball so it can be switched off for them.
+    in_play = np.ones(count, dtype=bool)
+    fall = np.zeros((count, 3))
+    fall[:, 2] = GRAVITY * dt
+    drag = 1 - BALL_DRAG * dt
+    rows = np.arange(count)
+    for step in range(1, steps + 1):
+        velocities *= drag
+        velocities += fall
+        locations += velocities * dt
+
+        heights = locations[:, 2]
+        under = heights < BALL_RADIUS
+        if under.any():
+            heights[under] = BALL_RADIUS
+            vertical = velocities[:, 2]
+            vertical[under & (vertical < 0)] *= -RESTITUTION
+
+        # Signed distance inside each surface; negative means the ball has gone into it. Most steps nothing has, and
+        # that one test is all they cost.
+        depth = locations @ _NORMALS.T - _OFFSETS
+        if depth.min() < 0:
+            # A ball past the back wall's plane is either in a goal mouth or bouncing off the wall.
+            in_mouth = (np.abs(locations[:, 0]) < GOAL_HALF_WIDTH - BALL_RADIUS) & \
+                       (locations[:, 2] < GOAL_HEIGHT - BALL_RADIUS)
+            depth[in_mouth, _BACK_WALLS] = np.inf
+            surface = np.argmin(depth, axis=1)
+            deepest = depth[rows, surface]
+            normal = _NORMALS[surface]
+            into = np.einsum('ij,ij->i', velocities, normal)
+            hit = (deepest < 0) & (into < 0)
+            if hit.any():
+                locations[hit] -= deepest[hit, None] * normal[hit]
+                velocities[hit] -= (1 + RESTITUTION) * into[hit, None] * normal[hit]
+
+            scored = in_mouth & in_play & (np.abs(locations[:, 1]) >= GOAL_THRESHOLD)
+            if scored.any():
+                goal_times[scored] = step * dt
+                goal_sides[scored] = np.sign(locations[scored, 1])
+                in_play[scored] = False
+                velocities[scored] = 0
+                fall[scored] = 0
+
+        if step % record_every == 0:
+            recorded_locations[:, step // record_every] = locations
+            recorded_velocities[:, step // record_every] = velocities
+
+    return BallPaths(np.arange(samples) * (dt * record_every), recorded_locations, recorded_velocities, goal_times,
+                     goal_sides)
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import numpy as np
+
+from util.drive_model import default_drive_table
+from util.vec import Vec3
+
+# Speed we assume when leaving a node, since a route is mostly driven at speed rather than from a standstill.
+CRUISE_SPEED = 1400
+# Pads further apart than this aren't linked directly, so shortest paths hop from pad to pad and pick boost up.
+MAX_HOP = 2500
+
+
+@dataclass
+class BoostRoute:
+    pads: List[int]  # Pad indices, in the order we drive over them
+    time: float  # Estimated seconds from the car to the target along the route
+    boost: float  # Boost collected on the way
+
+
+class BoostGraph:
+    """
+    Travel times between every pair of boost pads and a few landmarks (the goals), built once at match start.
+
+    times[i, j] is the drive-time-table estimate for driving straight from node i to node j. path_times[i, j] is the
+    fastest way from i to j through pads only, using hops of at most MAX_HOP, found with Floyd-Warshall, and
+    path_boost[i, j] is the boost picked up at the pads strictly between i and j on that path. Pads are nodes 0 to
+    num_pads - 1 and the landmarks come after them.
+
+    With those tables, best_route() prices every (first pad, last pad) pair of a route in one array expression.
+    """
+
+    def __init__(self, pad_locations: np.ndarray, pad_amounts: np.ndarray, landmarks: List[Vec3]):
+        self.num_pads = len(pad_locations)
+        self.locations = np.concatenate([np.asarray(pad_locations, dtype=float).reshape(-1, 3),
+                                         np.array([[l.x, l.y, l.z] for l in landmarks]).reshape(-1, 3)])
+        self.amounts = np.concatenate([np.asarray(pad_amounts, dtype=float), np.zeros(len(landmarks))])
+        count = len(self.locations)
+
+        offset = self.locations[None, :, :2] - self.locations[:, None, :2]
+        distance = np.hypot(offset[..., 0], offset[..., 1])
+        self.times = default_drive_table().time_to_reach(CRUISE_SPEED, distance, 0.0, 0.0)
+        np.fill_diagonal(self.times, 0)
+
+        # Floyd-Warshall over the hop-limited graph, remembering the next node on each path and the boost along it.
+        path_times = np.where(distance <= MAX_HOP, self.times, np.inf)
+        path_boost = np.zeros((count, count))
+        next_node = np.tile(np.arange(count), (count, 1))
+        for k in range(self.num_pads):
+            via = path_times[:, k, None] + path_times[None, k, :]
+            better = via < path_times
+            path_times = np.where(better, via, path_times)
+            path_boost = np.where(better, path_boost[:, k, None] + self.amounts[k] + path_boost[None, k, :], path_boost)
+            next_node = np.where(better, next_node[:, k, None], next_node)
+        self.path_times = path_times
+        self.path_boost = path_boost
+        self.next_node = next_node
+
+    def path(self, start: int, end: int) -> List[int]:
+        """Nodes on the fastest hop-limited path from start to end, including both ends."""
+        if not np.isfinite(self.path_times[start, end]):
+            return []
+        nodes = [start]
+        while start != end:
+            start = int(self.next_node[start, end])
+            nodes.append(start)
+        return nodes
+
+    def times_from(self, location: Vec3, velocity: Vec3, forward: Vec3, boost: float) -> np.ndarray:
+        """Drive time from a car to every node, from the car's actual speed, heading and boost."""
+        offset = self.locations[:, :2] - (location.x, location.y)
+        angle = np.arctan2(forward.x * offset[:, 1] - forward.y * offset[:, 0],
+                           forward.x * offset[:, 0] + forward.y * offset[:, 1])
+        return default_drive_table().time_to_reach(velocity.length(), np.hypot(offset[:, 0], offset[:, 1]), angle,
+                                                   boost)
+
+    def times_to(self, target: Vec3) -> np.ndarray:
+        """Drive time from every node to an arbitrary point."""
+        offset = self.locations[:, :2] - (target.x, target.y)
+        return default_drive_table().time_to_reach(CRUISE_SPEED, np.hypot(offset[:, 0], offset[:, 1]), 0.0, 0.0)
+
+    def best_route(self, start_times: np.ndarray, target: Union[int, Vec3], min_boost: float, time_limit: float,
+                   available: np.ndarray = None, direct_time: float = None) -> Optional[BoostRoute]:
+        """
+        The fastest route from the car to target that collects at least min_boost within time_limit seconds, or
+        None if there isn't one. A route drives straight to a first pad, follows the fastest hop-limited path to a
+        last pad, then drives straight to the target.
+
+        start_times comes from times_from(). target is a node index (a landmark) or a point on the field. available
+        optionally masks which pads can be the first or last pad, e.g. the ones that will have respawned in time.
+        Pads in the middle of a path are assumed to be there. If min_boost is 0 the route may skip pads entirely;
+        for a point target that needs direct_time, the time to drive straight there.
+        """
+        pads = self.num_pads
+        if isinstance(target, (int, np.integer)):
+            to_target = self.times[:, target]
+            direct_time = float(start_times[target])
+        else:
+            to_target = self.times_to(target)
+        if min_boost <= 0 and direct_time is not None and direct_time <= time_limit:
+            return BoostRoute([], direct_time, 0.0)
+        if pads == 0:
+            return None
+
+        amounts = self.amounts[:pads]
+        total_time = start_times[:pads, None] + self.path_times[:pads, :pads] + to_target[None, :pads]
+        collected = amounts[:, None] + self.path_boost[:pads, :pads] + np.where(np.eye(pads, dtype=bool), 0,
+                                                                               amounts[None, :])
+        feasible = (collected >= min_boost) & (total_time <= time_limit)
+        if available is not None:
+            feasible &= available[:, None] & available[None, :]
+        if not feasible.any():
+            return None
+        first, last = np.unravel_index(np.argmin(np.where(feasible, total_time, np.inf)), feasible.shape)
+        return BoostRoute(self.path(int(first), int(last)), float(total_time[first, last]),
+                          float(collected[first, last]))
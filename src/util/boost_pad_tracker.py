@@ -1,17 +1,49 @@
-from dataclasses import dataclass
-from typing import List
+import math
+from typing import List, Optional
 
+import numpy as np
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 
+from util.boost_graph import BoostGraph, BoostRoute
+from util.drive_model import MAX_SPEED, default_drive_table
+from util.packet_views import field_boost_pads, packet_views
+from util.spatial_index import GridIndex
+from util.tick_context import BLUE_GOAL, ORANGE_GOAL
 from util.vec import Vec3
 
+# How much boost a pad gives, and how long it takes to come back after being picked up.
+FULL_BOOST_AMOUNT = 100
+SMALL_BOOST_AMOUNT = 12
+FULL_BOOST_RESPAWN = 10.0
+SMALL_BOOST_RESPAWN = 4.0
+
 
-@dataclass
 class BoostPad:
-    location: Vec3
-    is_full_boost: bool
-    is_active: bool  # Active means it's available to be picked up
-    timer: float  # Counts the number of seconds that the pad has been *inactive*
+    """
+    One pad. Its location and size are fixed, while is_active and timer are read from the tracker's arrays, so a
+    BoostPad is always current without anyone copying state into it.
+    """
+    __slots__ = ('index', 'location', 'is_full_boost', '_tracker')
+
+    def __init__(self, tracker: 'BoostPadTracker', index: int, location: Vec3, is_full_boost: bool):
+        self.index = index
+        self.location = location
+        self.is_full_boost = is_full_boost
+        self._tracker = tracker
+
+    @property
+    def is_active(self) -> bool:
+        """Active means it's available to be picked up"""
+        return bool(self._tracker.is_active[self.index])
+
+    @property
+    def timer(self) -> float:
+        """Counts the number of seconds that the pad has been *inactive*"""
+        return float(self._tracker.timer[self.index])
+
+    def __repr__(self):
+        return f'BoostPad(location={self.location}, is_full_boost={self.is_full_boost}, ' \
+               f'is_active={self.is_active}, timer={self.timer})'
 
 
 class BoostPadTracker:
@@ -19,25 +51,140 @@ class BoostPadTracker:
     This class merges together the boost pad location info with the is_active info so you can access it
     in one convenient list. For it to function correctly, you need to call initialize_boosts once when the
     game has started, and then update_boost_status every frame so that it knows which pads are active.
+
+    The state lives in parallel arrays indexed by pad: locations, is_full, is_active and timer. Each update also
+    records which pads changed (changed, changed_bits) and when each pad was last picked up (pickup_times), so
+    boost planners can react to just the pads that changed, including pads an opponent just took.
     """
 
     def __init__(self):
         self.boost_pads: List[BoostPad] = []
         self._full_boosts_only: List[BoostPad] = []
+        self.index: GridIndex = None
+        self.graph: BoostGraph = None
+        self.locations = np.zeros((0, 3))
+        self.is_full = np.zeros(0, dtype=bool)
+        self.is_active = np.zeros(0, dtype=bool)
+        self.timer = np.zeros(0, dtype=np.float32)
+        # Which pads flipped between active and inactive on the last update, and which of those were pickups.
+        self.changed = np.zeros(0, dtype=bool)
+        self.picked_up = np.zeros(0, dtype=bool)
+        # Game time each pad was last seen being picked up, or -inf if we haven't seen that happen.
+        self.pickup_times = np.zeros(0)
+        # Whether is_active holds a real status yet, rather than the all-inactive start.
+        self._has_status = False
 
     def initialize_boosts(self, game_info: FieldInfoPacket):
-        raw_boosts = [game_info.boost_pads[i] for i in range(game_info.num_boosts)]
-        self.boost_pads: List[BoostPad] = [BoostPad(Vec3(rb.location), rb.is_full_boost, False, 0) for rb in raw_boosts]
+        raw_boosts = field_boost_pads(game_info)
+        count = len(raw_boosts)
+        self.locations = raw_boosts['location'].astype(float)
+        self.is_full = raw_boosts['is_full_boost'].copy()
+        self.is_active = np.zeros(count, dtype=bool)
+        self.timer = np.zeros(count, dtype=np.float32)
+        self.changed = np.zeros(count, dtype=bool)
+        self.picked_up = np.zeros(count, dtype=bool)
+        self.pickup_times = np.full(count, -np.inf)
+        self._has_status = False
+        self.boost_pads: List[BoostPad] = [BoostPad(self, i, Vec3(*location), is_full)
+                                           for i, (location, is_full)
+                                           in enumerate(zip(self.locations.tolist(), self.is_full.tolist()))]
         # Cache the list of full boosts since they're commonly requested.
         # They reference the same objects in the boost_pads list.
         self._full_boosts_only: List[BoostPad] = [bp for bp in self.boost_pads if bp.is_full_boost]
+        self.index = GridIndex(self.locations)
+        self._amounts = np.where(self.is_full, FULL_BOOST_AMOUNT, SMALL_BOOST_AMOUNT).astype(float)
+        self._respawn_times = np.where(self.is_full, FULL_BOOST_RESPAWN, SMALL_BOOST_RESPAWN)
+        # Pads never move, so travel times between them (and to both goals) are worked out once here.
+        self.graph = BoostGraph(self.locations, self._amounts, [BLUE_GOAL, ORANGE_GOAL])
 
     def update_boost_status(self, packet: GameTickPacket):
-        for i in range(packet.num_boost):
-            our_pad = self.boost_pads[i]
-            packet_pad = packet.game_boosts[i]
-            our_pad.is_active = packet_pad.is_active
-            our_pad.timer = packet_pad.timer
+        # Copy both columns straight out of the packet memory instead of going through ctypes pad by pad. While the
+        # match loads the packet can list fewer pads than the field info (or none), so only compare the ones it has.
+        count = min(packet.num_boost, len(self.boost_pads))
+        pads = packet_views(packet).boost_pads[:count]
+        is_active = pads['is_active']
+        if not self._has_status:
+            # The first status we get isn't news; don't report every active pad as having just respawned.
+            self.is_active[:count] = is_active
+            self._has_status = count > 0
+        self.changed[count:] = False
+        self.picked_up[count:] = False
+        np.not_equal(self.is_active[:count], is_active, out=self.changed[:count])
+        np.greater(self.is_active[:count], is_active, out=self.picked_up[:count])
+        if self.picked_up.any():
+            self.pickup_times[self.picked_up] = packet.game_info.seconds_elapsed
+        self.is_active[:count] = is_active
+        self.timer[:count] = pads['timer']
+
+    @property
+    def changed_bits(self) -> int:
+        """The changed array as an int, with bit i set if pad i changed on the last update."""
+        return int.from_bytes(np.packbits(self.changed, bitorder='little').tobytes(), 'little')
 
     def get_full_boosts(self) -> List[BoostPad]:
         return self._full_boosts_only
+
+    def nearest_pads(self, location: Vec3, k: int = 1) -> List[BoostPad]:
+        """The k pads closest to location on the ground, closest first, whether or not they're active."""
+        return [self.boost_pads[i] for i in self.index.nearest(location.x, location.y, k)]
+
+    def pads_along_path(self, start: Vec3, end: Vec3, max_detour: float = 300) -> List[BoostPad]:
+        """Pads within max_detour of the straight path from start to end, in the order we'd drive over them."""
+        return [self.boost_pads[i] for i in self.index.along_path(start.x, start.y, end.x, end.y, max_detour)]
+
+    def route_via_boost(self, car_location: Vec3, car_velocity: Vec3, car_forward: Vec3, car_boost: float,
+                        target: Vec3, min_boost: float, max_extra_time: float) -> Optional[BoostRoute]:
+        """
+        The fastest way to target that picks up at least min_boost and takes at most max_extra_time seconds longer
+        than driving straight there, or None. Only pads that will be up when we get to them can start or end the
+        route. Everything except the car's own row is a lookup into the precomputed BoostGraph.
+        """
+        if self.graph is None:
+            return None
+        start_times = self.graph.times_from(car_location, car_velocity, car_forward, car_boost)
+        to_target = (target - car_location).flat()
+        angle = math.atan2(car_forward.x * to_target.y - car_forward.y * to_target.x,
+                           car_forward.x * to_target.x + car_forward.y * to_target.y)
+        direct_time = default_drive_table().time_to_reach(car_velocity.length(), to_target.length(), angle, car_boost)
+        respawn = np.maximum(self._respawn_times - self.timer, 0.0)
+        available = self.is_active | (respawn <= start_times[:len(self.boost_pads)])
+        return self.graph.best_route(start_times, target, min_boost, direct_time + max_extra_time, available,
+                                     direct_time)
+
+    def get_best_boost(self, car_location: Vec3, car_velocity: Vec3 = None, car_forward: Vec3 = None,
+                       car_boost: float = 0, time_budget: float = 4.0) -> Optional[BoostPad]:
+        """
+        Returns the pad that gets us the most boost per second of driving, or None if nothing is worth it within
+        time_budget seconds. Only pads within driving range of the budget are looked at, using the spatial index.
+
+        Travel time comes from the drive-time table (pass car_velocity and car_forward for a better estimate). An
+        inactive pad counts if it will have respawned by the time we arrive, and we wait for it if it won't have.
+        The boost a pad is worth is capped at what we have room for.
+        """
+        if self.index is None:
+            return None
+        candidates = self.index.within(car_location.x, car_location.y, MAX_SPEED * time_budget)
+        if not candidates:
+            return None
+        candidates = np.array(candidates)
+        locations = self.index.points[candidates]
+
+        offset = locations - (car_location.x, car_location.y)
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        angle = 0.0
+        if car_forward is not None:
+            angle = np.arctan2(car_forward.x * offset[:, 1] - car_forward.y * offset[:, 0],
+                               car_forward.x * offset[:, 0] + car_forward.y * offset[:, 1])
+        speed = car_velocity.length() if car_velocity is not None else 0.0
+        travel_time = default_drive_table().time_to_reach(speed, distance, angle, car_boost)
+
+        respawn = np.where(self.is_active[candidates], 0.0,
+                           np.maximum(self._respawn_times[candidates] - self.timer[candidates], 0.0))
+        arrival = np.maximum(travel_time, respawn)
+        gain = np.minimum(self._amounts[candidates], max(100 - car_boost, 1))
+        # Half a second of slack keeps pads right under the car from winning on a near-zero time alone.
+        score = np.where(arrival <= time_budget, gain / (arrival + 0.5), -1.0)
+        best = int(np.argmax(score))
+        if score[best] < 0:
+            return None
+        return self.boost_pads[int(candidates[best])]
@@ -0,0 +1,123 @@
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from util.prediction_arrays import PredictionArrays, first_index
+
+# Channels of a prediction's BoundsPyramid. Derived channels (absolute values, horizontal speed) have their own
+# bounds, so a condition like |y| >= 5235 is a plain range on ABS_Y.
+TIME = 0
+X, Y, Z = 1, 2, 3
+VX, VY, VZ = 4, 5, 6
+ABS_Y = 7
+ABS_VZ = 8
+SPEED_XY = 9
+
+# A condition is (channel, low, high) and holds when low <= value <= high. Use -inf / inf for open ends, and
+# below() / above() to turn a strict comparison into an inclusive one.
+Condition = Tuple[int, float, float]
+
+
+def below(value: float) -> float:
+    """The largest float under value, so 'x < value' can be written as 'x <= below(value)'."""
+    return math.nextafter(value, -math.inf)
+
+
+def above(value: float) -> float:
+    """The smallest float over value, so 'x > value' can be written as 'x >= above(value)'."""
+    return math.nextafter(value, math.inf)
+
+
+class BoundsPyramid:
+    """
+    Minimum and maximum of each channel over a sequence of rows, for the whole range and for every block of
+    leaf_size rows.
+
+    A range query first checks the whole-range bounds, which rejects most queries that can't match at all. It then
+    checks every block's bounds and only looks at rows in blocks that overlap every condition, so blocks that can't
+    hold a match are skipped whole. Unlike checking every n-th row, this never misses a short run of matches, because
+    a block's bounds cover all of its rows.
+
+    The pyramid stops at two levels on purpose. With a few hundred slices one vectorized pass over the block bounds
+    costs less than walking more levels down from the top.
+    """
+
+    def __init__(self, values: np.ndarray, leaf_size: int = 8):
+        self.values = values
+        self.leaf_size = leaf_size
+        count, channels = values.shape
+        if count == 0:
+            self.block_mins = self.block_maxs = np.zeros((channels, 0), dtype=values.dtype)
+            self.mins = [math.inf] * channels
+            self.maxs = [-math.inf] * channels
+            return
+        starts = np.arange(0, count, leaf_size)
+        # Stored channel-major so each condition reads a contiguous row.
+        self.block_mins = np.ascontiguousarray(np.minimum.reduceat(values, starts, axis=0).T)
+        self.block_maxs = np.ascontiguousarray(np.maximum.reduceat(values, starts, axis=0).T)
+        self.mins = self.block_mins.min(axis=1).tolist()
+        self.maxs = self.block_maxs.max(axis=1).tolist()
+
+    def may_match(self, conditions: Sequence[Condition]) -> bool:
+        """False if no row at all can meet every condition, judging by the whole-range bounds alone."""
+        mins = self.mins
+        maxs = self.maxs
+        return all(maxs[channel] >= low and mins[channel] <= high for channel, low, high in conditions)
+
+    def candidate_blocks(self, conditions: Sequence[Condition]) -> np.ndarray:
+        """Indices of the blocks whose bounds overlap every condition, in order."""
+        if not self.may_match(conditions):
+            return np.zeros(0, dtype=int)
+        keep = None
+        for channel, low, high in conditions:
+            overlaps = (self.block_maxs[channel] >= low) & (self.block_mins[channel] <= high)
+            keep = overlaps if keep is None else keep & overlaps
+        if keep is None:
+            return np.arange(self.block_mins.shape[1])
+        return np.flatnonzero(keep)
+
+    def candidate_rows(self, conditions: Sequence[Condition]) -> np.ndarray:
+        """Indices of every row in a candidate block. All rows that match are among them."""
+        blocks = self.candidate_blocks(conditions)
+        rows = (blocks[:, None] * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        return rows[rows < len(self.values)]
+
+    def first(self, conditions: Sequence[Condition]) -> int:
+        """Index of the first row meeting every condition, or -1."""
+        rows = self.candidate_rows(conditions)
+        if len(rows) == 0:
+            return -1
+        # Check the surviving rows exactly, all at once.
+        candidates = self.values[rows]
+        match = np.ones(len(rows), dtype=bool)
+        for channel, low, high in conditions:
+            column = candidates[:, channel]
+            match &= (low <= column) & (column <= high)
+        index = first_index(match)
+        return int(rows[index]) if index >= 0 else -1
+
+
+def prediction_channels(prediction: PredictionArrays, start: int = 0) -> np.ndarray:
+    """
+    A (N, 10) array with one row per slice and the channels defined at the top of this module as columns. Pass start
+    to get only the rows from that slice on.
+    """
+    locations = prediction.locations[start:]
+    velocities = prediction.velocities[start:]
+    return np.column_stack((prediction.times[start:], locations, velocities, np.abs(locations[:, 1]),
+                            np.abs(velocities[:, 2]), np.hypot(velocities[:, 0], velocities[:, 1])))
+
+
+def shift_channels(previous: np.ndarray, prediction: PredictionArrays, shift: int) -> np.ndarray:
+    """
+    The channel table of prediction, given the table of the prediction before it and that prediction is the same one
+    moved forward by shift slices. Only the new rows at the end are computed.
+    """
+    keep = len(previous) - shift
+    return np.concatenate((previous[shift:], prediction_channels(prediction, keep)))
+
+
+def prediction_bounds(prediction: PredictionArrays) -> BoundsPyramid:
+    """A BoundsPyramid over a ball prediction's slices, with the channels defined at the top of this module."""
+    return BoundsPyramid(prediction_channels(prediction))
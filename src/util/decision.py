@@ -1,4 +1,4 @@
-from util.vec import Vec3
+from util.tick_context import TickContext
 
 class BotDecision:
     ATTACK = 'attack'
@@ -10,18 +10,17 @@ class BotDecision:
     DRIBBLE = 'dribble'
     NONE = 'none'
 
-def decide_action(agent, packet, car_location, car_velocity, car_forward, ball_location, ball_velocity, my_goal, opponent_goal):
+def decide_action(ctx: TickContext):
     """
     Returns a string representing the bot's high-level action.
     """
-    my_car = packet.game_cars[agent.index]
-    boost = my_car.boost
-    ball_to_my_goal = my_goal - ball_location
-    ball_to_opponent_goal = opponent_goal - ball_location
+    car_location = ctx.car.location
+    ball_location = ctx.ball_location
+    boost = ctx.car.boost
     car_to_ball = ball_location - car_location
-    dist_to_ball = car_location.dist(ball_location)
-    dist_ball_to_my_goal = ball_location.dist(my_goal)
-    dist_ball_to_opponent_goal = ball_location.dist(opponent_goal)
+    dist_to_ball = ctx.dist_to_ball
+    dist_ball_to_my_goal = ctx.dist_ball_to_my_goal
+    dist_ball_to_opponent_goal = ctx.dist_ball_to_opponent_goal
     
     # 1. Boost logic: If low on boost and not in immediate danger, go for boost
     if boost < 20 and dist_to_ball > 1200 and abs(car_to_ball.z) < 200:
@@ -32,7 +31,7 @@ def decide_action(agent, packet, car_location, car_velocity, car_forward, ball_l
         return BotDecision.DEFEND
     
     # 3. Clear: If ball is in our half and we're behind it, clear
-    if abs(ball_location.y) < 2000 and car_location.y * agent.team < 0 and dist_to_ball < 900:
+    if abs(ball_location.y) < 2000 and car_location.y * ctx.team < 0 and dist_to_ball < 900:
         return BotDecision.CLEAR
     
     # 4. Intercept: If we can reach the ball before opponent, intercept
@@ -48,7 +47,7 @@ def decide_action(agent, packet, car_location, car_velocity, car_forward, ball_l
         return BotDecision.ATTACK
     
     # 7. Dribble: If ball is on roof or close and slow, dribble
-    if abs(car_to_ball.z) < 120 and dist_to_ball < 350 and ball_velocity.length() < 600:
+    if abs(car_to_ball.z) < 120 and dist_to_ball < 350 and ctx.ball_speed < 600:
         return BotDecision.DRIBBLE
     
     return BotDecision.NONE
@@ -1,6 +1,6 @@
 from rlbot.agents.base_agent import SimpleControllerState
 from util.ball_control import get_ball_state, get_dribble_state
-from util.vec import Vec3
+from util.tick_context import TickContext
 import maneuvers
 
 class DribbleController:
@@ -11,13 +11,14 @@ class DribbleController:
         self.last_catch_attempt = 0
         self.MIN_FLICK_INTERVAL = 2.0  # Minimum seconds between flicks
         
-    def execute(self, packet):
+    def execute(self, ctx: TickContext):
         """
         Main dribble control function. Returns SimpleControllerState.
         If a sequence is needed, it sets the agent's active_sequence and returns its tick.
         """
-        current_time = packet.game_info.seconds_elapsed
-        ball_state = get_ball_state(packet, self.agent.index)
+        packet = ctx.packet
+        current_time = ctx.time
+        ball_state = get_ball_state(ctx)
         dribble_state = get_dribble_state(ball_state)
 
         # If we're already in a sequence, use that
@@ -40,9 +41,9 @@ class DribbleController:
                 self.dribble_started = True
 
             # Check if we should flick
-            if self.should_flick(packet, ball_state):
+            if self.should_flick(ctx, ball_state):
                 self.last_flick_time = current_time
-                self.agent.active_sequence = self.choose_flick(packet, ball_state)
+                self.agent.active_sequence = self.choose_flick(ctx, ball_state)
                 return self.agent.active_sequence.tick(packet)
 
             # Otherwise maintain dribble
@@ -51,32 +52,23 @@ class DribbleController:
         self.dribble_started = False
         return None  # Let normal control take over
     
-    def should_flick(self, packet, ball_state):
+    def should_flick(self, ctx: TickContext, ball_state):
         """Determines if we should attempt a flick."""
-        current_time = packet.game_info.seconds_elapsed
+        current_time = ctx.time
         if current_time - self.last_flick_time < self.MIN_FLICK_INTERVAL:
             return False
             
         # Check if opponent is close and we should flick
-        for i in range(packet.num_cars):
-            if i != self.agent.index and packet.game_cars[i].team != self.agent.team:
-                opponent_loc = Vec3(packet.game_cars[i].physics.location)
-                if opponent_loc.dist(ball_state['ball_loc']) < 1000:
-                    return True
-        
-        return False
+        return bool((ctx.opponent_locations.dist(ball_state['ball_loc']) < 1000).any())
     
-    def choose_flick(self, packet, ball_state):
+    def choose_flick(self, ctx: TickContext, ball_state):
         """Chooses the best flick type for the situation."""
         ball_loc = ball_state['ball_loc']
         car_loc = ball_state['car_loc']
         
-        # Get opponent goal location
-        opponent_goal = Vec3(0, 5120 if self.agent.team == 0 else -5120, 0)
-        
         # Calculate angle to goal
-        to_goal = (opponent_goal - car_loc).normalized()
-        car_forward = self.agent.get_car_forward_vector(packet)
+        to_goal = (ctx.opponent_goal - car_loc).normalized()
+        car_forward = self.agent.get_car_forward_vector(ctx)
         angle = car_forward.ang_to(to_goal)
         
         if abs(angle) < 0.2:  # Fairly straight on
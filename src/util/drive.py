@@ -1,9 +1,13 @@
 import math
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
 
-from rlbot.utils.structures.game_data_struct import PlayerInfo # type: ignore
+import numpy as np
 
-from util.orientation import Orientation, relative_location
-from util.vec import Vec3
+from util.drive_model import ARC_EPSILON, default_drive_table, turn_radius
+from util.orientation import relative_location, relative_locations
+from util.tick_context import CarState
+from util.vec import Vec3, Vec3Array
 
 
 def limit_to_safe_range(value: float) -> float:
@@ -19,7 +23,237 @@ def limit_to_safe_range(value: float) -> float:
     return value
 
 
-def steer_toward_target(car: PlayerInfo, target: Vec3) -> float:
-    relative = relative_location(Vec3(car.physics.location), Orientation(car.physics.rotation), target)
+def steer_toward_target(car: CarState, target: Vec3) -> float:
+    relative = relative_location(car.location, car.orientation, target)
     angle = math.atan2(relative.y, relative.x)
     return limit_to_safe_range(angle * 5)
+
+
+@dataclass
+class Approaches:
+    """How a car would drive to each of a batch of candidate targets. Every array is indexed by target."""
+    relative: np.ndarray  # (N, 3) each target as (in front, right, above) the car, like relative_location
+    angles: np.ndarray  # (N,) signed turn to face the target in radians, positive to the right
+    steers: np.ndarray  # (N,) what steer_toward_target returns for the target
+    times: np.ndarray  # (N,) estimated seconds to drive there, from the drive time table
+
+    def fastest(self) -> int:
+        """Index of the target we'd reach first."""
+        return int(np.argmin(self.times))
+
+
+def evaluate_approaches(car: CarState, targets: Union[np.ndarray, Vec3Array, Sequence[Vec3]]) -> Approaches:
+    """
+    steer_toward_target and a drive time estimate for many targets in one vectorized call, so choosing between a back
+    post, a shadow spot and a boost pad is a matter of comparing arrays. targets is an (N, 3) array, a Vec3Array or a
+    list of Vec3s.
+
+    Everything is measured in the car's frame with its orientation's cached rotation matrix. Times come from the
+    same drive time table as PositionPredictor.times_to_reach, at the car's speed and boost.
+    """
+    if isinstance(targets, Vec3Array):
+        targets = targets.data
+    elif not isinstance(targets, np.ndarray):
+        targets = Vec3Array.from_vecs(targets).data
+    location = car.location
+    relative = relative_locations((location.x, location.y, location.z), car.orientation.matrix(), targets)
+    ahead = relative[:, 0]
+    right = relative[:, 1]
+    angles = np.arctan2(right, ahead)
+    steers = np.clip(angles * 5, -1, 1)
+    times = default_drive_table().time_to_reach(car.speed, np.hypot(ahead, right), angles, car.boost)
+    return Approaches(relative, angles, steers, times)
+
+
+# Paths are planned for at least this speed, so a car starting from rest gets turns it can still hold once it's
+# moving, and a finite time for them.
+MIN_TURN_SPEED = 500
+# Spacing of the points a DubinsPath keeps to find where along it the car is.
+PATH_STEP = 25
+# Following a path steers toward the point this far ahead along it: at least LOOKAHEAD, more at speed.
+LOOKAHEAD = 150
+LOOKAHEAD_TIME = 0.2
+# PathPlanner plans again once the car is further than REPLAN_DISTANCE from its path, or the target moved further
+# than that or turned further than REPLAN_ANGLE since the path was planned.
+REPLAN_DISTANCE = 150
+REPLAN_ANGLE = 0.3
+
+
+def heading_of(direction: Vec3) -> float:
+    """The yaw angle a direction points along on the ground, like Rotator.yaw."""
+    return math.atan2(direction.y, direction.x)
+
+
+def angle_difference(a: float, b: float) -> float:
+    """a - b, wrapped into [-pi, pi)."""
+    return (a - b + math.pi) % (2 * math.pi) - math.pi
+
+
+class DubinsPath:
+    """
+    The shortest ground path from a car's location and heading to a target reached at a required heading, made of a
+    turn, a straight line and another turn (Dubins' CSC paths). Both turns use the tightest radius the car holds at
+    the speed the path is planned for, from drive_model.turn_radius. Following it with steer() arrives at the target
+    already facing the right way, where steer_toward_target would arrive at whatever angle it happens to.
+
+    Headings are yaw angles (see heading_of()). Turn directions are steer signs: 1 turns right, which increases the
+    heading, and -1 turns left. Distances along the path are measured from its start.
+    """
+    __slots__ = [
+        'target',
+        'heading',
+        'speed',
+        'radius',
+        'turns',
+        'arcs',
+        'straight',
+        'length',
+        '_start_heading',
+        '_line_heading',
+        '_centers',
+        '_distances',
+        '_points',
+    ]
+
+    def __init__(self, start: Vec3, start_heading: float, target: Vec3, heading: float, speed: float):
+        speed = max(speed, MIN_TURN_SPEED)
+        radius = float(turn_radius(speed))
+        best = None
+        for first in (1, -1):
+            first_center = _turn_center(start, start_heading, first, radius)
+            for second in (1, -1):
+                second_center = _turn_center(target, heading, second, radius)
+                dx = second_center[0] - first_center[0]
+                dy = second_center[1] - first_center[1]
+                between = math.hypot(dx, dy)
+                if first == second:
+                    # Outer tangent, parallel to the line between the centers.
+                    straight = between
+                    line_heading = math.atan2(dy, dx)
+                else:
+                    # Inner tangent, which crosses between the circles and needs them apart.
+                    if between < 2 * radius:
+                        continue
+                    straight = math.sqrt(between ** 2 - 4 * radius ** 2)
+                    line_heading = math.atan2(dy, dx) + first * math.atan2(2 * radius, straight)
+                first_arc = _arc(first, start_heading, line_heading)
+                second_arc = _arc(second, line_heading, heading)
+                length = radius * (first_arc + second_arc) + straight
+                if best is None or length < best[0]:
+                    best = (length, (first, second), (first_arc, second_arc), straight, line_heading,
+                            (first_center, second_center))
+
+        self.target = target
+        self.heading = heading
+        self.speed = speed
+        self.radius = radius
+        self.length, self.turns, self.arcs, self.straight, self._line_heading, self._centers = best
+        self._start_heading = start_heading
+        self._distances = np.append(np.arange(0, self.length, PATH_STEP), self.length)
+        self._points = self._points_at(self._distances)
+
+    def _points_at(self, distances: np.ndarray) -> np.ndarray:
+        # (N, 2) ground points at the given distances along the path. Past the end it carries on straight ahead.
+        radius = self.radius
+        first, second = self.turns
+        (x1, y1), (x2, y2) = self._centers
+        line_heading = self._line_heading
+        first_end = radius * self.arcs[0]
+        line_end = first_end + self.straight
+
+        first_angle = self._start_heading + first * np.minimum(distances, first_end) / radius
+        line_start = (x1 + first * radius * math.sin(line_heading), y1 - first * radius * math.cos(line_heading))
+        along_line = np.clip(distances - first_end, 0, self.straight)
+        second_angle = line_heading + second * np.clip(distances - line_end, 0, radius * self.arcs[1]) / radius
+        beyond = np.maximum(distances - self.length, 0)
+
+        points = np.empty((len(distances), 2))
+        on_first = distances <= first_end
+        on_line = ~on_first & (distances <= line_end)
+        on_second = ~(on_first | on_line)
+        points[on_first, 0] = x1 + first * radius * np.sin(first_angle[on_first])
+        points[on_first, 1] = y1 - first * radius * np.cos(first_angle[on_first])
+        points[on_line, 0] = line_start[0] + along_line[on_line] * math.cos(line_heading)
+        points[on_line, 1] = line_start[1] + along_line[on_line] * math.sin(line_heading)
+        points[on_second, 0] = x2 + second * radius * np.sin(second_angle[on_second]) + \
+            beyond[on_second] * math.cos(self.heading)
+        points[on_second, 1] = y2 - second * radius * np.cos(second_angle[on_second]) + \
+            beyond[on_second] * math.sin(self.heading)
+        return points
+
+    def point_at(self, distance: float) -> Vec3:
+        """The point this far along the path, at the target's height. Past the end it continues along heading."""
+        x, y = self._points_at(np.array([distance]))[0].tolist()
+        return Vec3.from_xyz(x, y, self.target.z)
+
+    def progress(self, location: Vec3, after: float = 0) -> Tuple[float, float]:
+        """
+        How far along the path the point nearest location is, and how far location is from it, looking only at the
+        path from after on. Pass the last progress as after so a path that loops near itself doesn't send us back.
+        """
+        start = max(int(after // PATH_STEP) - 1, 0)
+        offsets = self._points[start:] - (location.x, location.y)
+        distances_sq = np.einsum('ij,ij->i', offsets, offsets)
+        nearest = int(np.argmin(distances_sq))
+        return float(self._distances[start + nearest]), math.sqrt(distances_sq[nearest])
+
+    def time(self, speed: float, boost: float, progress: float = 0) -> float:
+        """
+        Estimated seconds to drive the rest of the path from progress on: the turns at the planned speed, and the
+        straight from the drive time table, accelerating from speed with the given boost.
+        """
+        first_end = self.radius * self.arcs[0]
+        line_end = first_end + self.straight
+        turning = max(first_end - progress, 0) + min(self.length - max(progress, line_end), self.length - line_end)
+        straight = max(line_end - max(progress, first_end), 0)
+        return turning / self.speed + default_drive_table().time_to_reach(speed, straight, 0.0, boost)
+
+    def steer(self, car: CarState, progress: float = 0) -> float:
+        """Steer to follow the path from progress on, toward a point a little further along it."""
+        lookahead = max(LOOKAHEAD, car.speed * LOOKAHEAD_TIME)
+        return steer_toward_target(car, self.point_at(progress + lookahead))
+
+
+def _arc(turn: int, start_heading: float, end_heading: float) -> float:
+    # Radians turned in the direction turn to get from start_heading to end_heading. When they are the same, rounding
+    # can leave the difference a hair below zero, which the wrap would turn into a whole circle.
+    arc = (turn * (end_heading - start_heading)) % (2 * math.pi)
+    return 0.0 if arc > 2 * math.pi - ARC_EPSILON else arc
+
+
+def _turn_center(location: Vec3, heading: float, turn: int, radius: float) -> Tuple[float, float]:
+    # Center of the circle driven from location and heading when turning fully in the direction turn.
+    return location.x - turn * radius * math.sin(heading), location.y + turn * radius * math.cos(heading)
+
+
+class PathPlanner:
+    """
+    Plans DubinsPaths and keeps following the same one across ticks. plan() returns the path from the last tick while
+    the car is still within REPLAN_DISTANCE of it, hasn't finished it, and the target and heading asked for are close
+    to the ones it was planned for; otherwise it plans a new one. plans and reuses count the two cases, like the
+    hits and misses of PredictionCache.
+    """
+
+    def __init__(self):
+        self.path: DubinsPath = None
+        self.progress = 0.0
+        self.plans = 0
+        self.reuses = 0
+
+    def plan(self, car: CarState, target: Vec3, heading: float) -> DubinsPath:
+        path = self.path
+        if path is not None and path.target.flat_dist(target) <= REPLAN_DISTANCE \
+                and abs(angle_difference(path.heading, heading)) <= REPLAN_ANGLE:
+            progress, deviation = path.progress(car.location, self.progress)
+            if deviation <= REPLAN_DISTANCE and progress < path.length:
+                self.progress = progress
+                self.reuses += 1
+                return path
+        self.path = DubinsPath(car.location, heading_of(car.orientation.forward), target, heading, car.speed)
+        self.progress = 0.0
+        self.plans += 1
+        return self.path
+
+    def steer(self, car: CarState) -> float:
+        """Steer along the current path. Call plan() first in the same tick."""
+        return self.path.steer(car, self.progress)
@@ -0,0 +1,187 @@
+import math
+
+import numpy as np
+
+from util.grid_lookup import interpolate, interpolate_scalar
+from util.table_cache import load_or_build
+
+# Ground driving physics for a standard car, from https://samuelpmish.github.io/notes/RocketLeague/ground_control/
+MAX_SPEED = 2300
+BOOST_ACCELERATION = 991.666
+BOOST_PER_SECOND = 33.3
+
+# Throttle acceleration as a function of forward speed. There is none past 1410 uu/s; only boost goes faster.
+THROTTLE_ACCEL_SPEEDS = [0, 1400, 1410, MAX_SPEED]
+THROTTLE_ACCEL_VALUES = [1600, 160, 0, 0]
+
+# Turn curvature (1 / radius) at full steer as a function of forward speed.
+CURVATURE_SPEEDS = [0, 500, 1000, 1500, 1750, MAX_SPEED]
+CURVATURE_VALUES = [0.0069, 0.00398, 0.00235, 0.001375, 0.0011, 0.00088]
+
+# Table grids. All four axes are uniform, so finding a cell is a division, not a search.
+SPEED_STEP = 100
+DISTANCE_STEP = 100
+MAX_DISTANCE = 12000
+ANGLE_BINS = 17  # 0 to pi inclusive
+BOOST_STEP = 10
+
+# Turn angles this close to a full circle are rounding errors on a turn of zero.
+ARC_EPSILON = 1e-6
+
+SIMULATION_DT = 1 / 120
+SIMULATION_TIME = 8.0
+
+# Bump this when _build() changes in a way the constants above don't capture, so cached tables get rebuilt.
+TABLE_VERSION = 2
+
+
+def throttle_acceleration(speed):
+    """Forward acceleration from full throttle at the given speed. Works on floats and arrays."""
+    return np.interp(speed, THROTTLE_ACCEL_SPEEDS, THROTTLE_ACCEL_VALUES)
+
+
+def turn_radius(speed):
+    """Radius of the tightest turn the car can make at the given speed. Works on floats and arrays."""
+    return 1 / np.interp(speed, CURVATURE_SPEEDS, CURVATURE_VALUES)
+
+
+def turn_path_length(speed, distance, angle):
+    """
+    Length of the path that turns at full lock until facing the target, then drives straight to it. angle is how far
+    the target is off our nose, between 0 and pi. If the target is inside our turning circle we can't reach it this
+    way, so we estimate a turn on the spot followed by the full distance instead.
+    """
+    radius = turn_radius(speed)
+    # Put the turning circle's center at (0, radius) and the target at distance along the heading angle.
+    target_x = distance * np.cos(angle)
+    target_y = distance * np.sin(angle)
+    center_dist_sq = target_x ** 2 + (target_y - radius) ** 2
+    reachable = center_dist_sq > radius ** 2
+    tangent = np.sqrt(np.maximum(center_dist_sq - radius ** 2, 0))
+    # Angle around the circle at which the tangent line leaves for the target.
+    center_dist = np.sqrt(center_dist_sq)
+    leave_angle = np.arctan2(target_y - radius, target_x) - np.arccos(np.clip(radius / np.maximum(center_dist, 1e-6),
+                                                                              -1, 1))
+    arc = np.mod(leave_angle + math.pi / 2, 2 * math.pi)
+    # A target dead ahead needs no turn, but rounding can leave the angle a hair below zero, which the wrap above turns
+    # into a whole circle.
+    arc = np.where(arc > 2 * math.pi - ARC_EPSILON, 0, arc)
+    return np.where(reachable, radius * arc + tangent, radius * angle + distance)
+
+
+class DriveTimeTable:
+    """
+    Precomputed time for a car to reach a point on the ground, indexed by (current speed, distance, heading angle,
+    boost amount). Building it simulates full-throttle acceleration with and without boost and the tightest turn at
+    each speed. Looking it up is an O(1) multilinear interpolation that works on whole arrays of targets at once.
+
+    The model: turn at full lock until facing the target, then drive straight, accelerating the whole way and
+    boosting while there is boost left.
+    """
+
+    def __init__(self, times: np.ndarray = None):
+        self.speeds = np.arange(0, MAX_SPEED + SPEED_STEP, SPEED_STEP, dtype=float)
+        self.distances = np.arange(0, MAX_DISTANCE + DISTANCE_STEP, DISTANCE_STEP, dtype=float)
+        self.angles = np.linspace(0, math.pi, ANGLE_BINS)
+        self.boosts = np.arange(0, 100 + BOOST_STEP, BOOST_STEP, dtype=float)
+        # times[speed, distance, angle, boost]
+        self.times = times if times is not None else self._build()
+
+    def _build(self) -> np.ndarray:
+        speed_grid, boost_grid = np.meshgrid(self.speeds, self.boosts, indexing='ij')
+        # Drive straight from every (speed, boost) start and record how far we got after each step.
+        speed = speed_grid.copy()
+        boost = boost_grid.copy()
+        steps = int(SIMULATION_TIME / SIMULATION_DT)
+        covered = np.zeros((steps + 1,) + speed.shape)
+        for step in range(1, steps + 1):
+            boosting = boost > 0
+            accel = throttle_acceleration(speed) + np.where(boosting, BOOST_ACCELERATION, 0)
+            new_speed = np.minimum(speed + accel * SIMULATION_DT, MAX_SPEED)
+            covered[step] = covered[step - 1] + (speed + new_speed) / 2 * SIMULATION_DT
+            speed = new_speed
+            boost = np.where(boosting, boost - BOOST_PER_SECOND * SIMULATION_DT, boost)
+        sample_times = np.arange(steps + 1) * SIMULATION_DT
+
+        # The path we need to drive depends only on speed, distance and angle.
+        path = turn_path_length(self.speeds[:, None, None], self.distances[None, :, None], self.angles[None, None, :])
+        # Turning at full lock makes a target just beside or behind us, inside the turning circle, look further away
+        # than one a bit further out. The real car powerslides or backs up there, so never let a target cost more
+        # than one further away or further off our nose. That keeps the times monotone in distance and angle.
+        path = np.minimum.accumulate(path[:, ::-1, :], axis=1)[:, ::-1, :]
+        path = np.minimum.accumulate(path[:, :, ::-1], axis=2)[:, :, ::-1]
+
+        times = np.empty((len(self.speeds), len(self.distances), len(self.angles), len(self.boosts)), dtype=np.float32)
+        for i in range(len(self.speeds)):
+            for k in range(len(self.boosts)):
+                curve = covered[:, i, k]
+                lengths = path[i]
+                t = np.interp(lengths, curve, sample_times)
+                # Past the end of the simulation we just keep going at the final speed.
+                beyond = lengths > curve[-1]
+                t[beyond] = sample_times[-1] + (lengths[beyond] - curve[-1]) / max(speed[i, k], 1)
+                times[i, :, :, k] = t
+        return times
+
+    def time_to_reach(self, speed, distance, angle, boost):
+        """
+        Seconds to reach a target. All arguments may be floats or arrays that broadcast together; angle is the
+        absolute angle between our nose and the target, and is clamped to [0, pi]. Distances past the table are
+        extended at top speed. Returns a float if every argument was a scalar, otherwise an array.
+        """
+        if not any(isinstance(arg, np.ndarray) for arg in (speed, distance, angle, boost)):
+            return self._time_to_reach_scalar(float(speed), float(distance), float(angle), float(boost))
+
+        # Plain minimum/maximum rather than np.clip, and filling one position array rather than broadcasting and
+        # stacking four: with a few dozen targets the per-call overhead is most of the cost.
+        speed = np.minimum(np.maximum(speed, 0.0), MAX_SPEED)
+        distance = np.maximum(distance, 0.0)
+        angle = np.minimum(np.abs(angle), math.pi)
+        boost = np.minimum(np.maximum(boost, 0.0), 100.0)
+        overshoot = np.maximum(distance - MAX_DISTANCE, 0)
+        position = np.empty(np.broadcast_shapes(np.shape(speed), np.shape(distance), np.shape(angle),
+                                                np.shape(boost)) + (4,))
+        position[..., 0] = speed / SPEED_STEP
+        position[..., 1] = np.minimum(distance, MAX_DISTANCE) / DISTANCE_STEP
+        position[..., 2] = angle / (math.pi / (ANGLE_BINS - 1))
+        position[..., 3] = boost / BOOST_STEP
+        return interpolate(self.times, position) + overshoot / MAX_SPEED
+
+    def _time_to_reach_scalar(self, speed: float, distance: float, angle: float, boost: float) -> float:
+        speed = min(max(speed, 0), MAX_SPEED)
+        distance = max(distance, 0)
+        angle = min(abs(angle), math.pi)
+        boost = min(max(boost, 0), 100)
+        overshoot = max(distance - MAX_DISTANCE, 0)
+        position = (speed / SPEED_STEP, min(distance, MAX_DISTANCE) / DISTANCE_STEP,
+                    angle / (math.pi / (ANGLE_BINS - 1)), boost / BOOST_STEP)
+        return interpolate_scalar(self.times, position) + overshoot / MAX_SPEED
+
+
+_default_table: DriveTimeTable = None
+
+
+def default_drive_table() -> DriveTimeTable:
+    """
+    The shared DriveTimeTable. The first call maps it from the on-disk table cache, building and saving it only if
+    no table was built from the current constants yet.
+    """
+    global _default_table
+    if _default_table is None:
+        arrays = load_or_build('drive_time', table_parameters(), lambda: {'times': DriveTimeTable().times})
+        _default_table = DriveTimeTable(times=arrays['times'])
+    return _default_table
+
+
+def table_parameters() -> dict:
+    """Everything the drive time table is built from. A change to any of it invalidates cached tables."""
+    return {
+        'version': TABLE_VERSION,
+        'max_speed': MAX_SPEED,
+        'boost_acceleration': BOOST_ACCELERATION,
+        'boost_per_second': BOOST_PER_SECOND,
+        'throttle_accel': [THROTTLE_ACCEL_SPEEDS, THROTTLE_ACCEL_VALUES],
+        'curvature': [CURVATURE_SPEEDS, CURVATURE_VALUES],
+        'grid': [SPEED_STEP, DISTANCE_STEP, MAX_DISTANCE, ANGLE_BINS, BOOST_STEP],
+        'simulation': [SIMULATION_DT, SIMULATION_TIME],
+    }
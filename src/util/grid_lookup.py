@@ -0,0 +1,87 @@
+import itertools
+
+import numpy as np
+
+
+def interpolate(table: np.ndarray, position: np.ndarray) -> np.ndarray:
+    """
+    Multilinear interpolation into an N-dimensional table on a uniform grid. position has shape (..., N) and holds
+    fractional grid coordinates, one per table axis; values outside the table are clamped to its edges. Returns an
+    array of shape (...).
+
+    All 2^N surrounding grid points are gathered with one flat take and then blended one axis at a time, so the cost
+    per lookup is O(1) no matter how big the table is.
+    """
+    upper, last_cell, element_strides, corners = _grid(table)
+    position = np.minimum(np.maximum(position, 0), upper)
+    index = np.minimum(position.astype(int), last_cell)
+    frac = position - index
+    weights = 1 - frac
+
+    base = index @ element_strides
+    # Corners are in C order, so neighbours along the last remaining axis are always adjacent pairs.
+    values = table.ravel().take(base[..., None] + corners)
+    for axis in range(table.ndim - 1, -1, -1):
+        values = values[..., 0::2] * weights[..., axis, None] + values[..., 1::2] * frac[..., axis, None]
+    return values[..., 0]
+
+
+def interpolate_scalar(table: np.ndarray, position) -> float:
+    """
+    Same as interpolate() for a single point, in plain Python. For one lookup NumPy's per-call overhead costs more
+    than the arithmetic, so this is several times faster.
+    """
+    base = 0
+    fracs = []
+    for pos, size, stride in zip(position, table.shape, _c_order_strides(table.shape)):
+        pos = min(max(pos, 0), size - 1)
+        i = min(int(pos), size - 2)
+        base += i * stride
+        fracs.append(pos - i)
+    item = table.item
+    values = [item(base + offset) for offset in _flat_corner_offsets(table)]
+    # Blend pairs along the last axis first, exactly like interpolate().
+    for f in reversed(fracs):
+        values = [values[k] * (1 - f) + values[k + 1] * f for k in range(0, len(values), 2)]
+    return values[0]
+
+
+_CORNER_OFFSETS = {}
+_FLAT_CORNER_OFFSETS = {}
+_GRIDS = {}
+
+
+def _corner_offsets(ndim: int) -> np.ndarray:
+    # Offsets of the 2^ndim corners of a grid cell, e.g. [[0, 0], [0, 1], [1, 0], [1, 1]] for 2D.
+    if ndim not in _CORNER_OFFSETS:
+        _CORNER_OFFSETS[ndim] = np.array(list(itertools.product((0, 1), repeat=ndim)))
+    return _CORNER_OFFSETS[ndim]
+
+
+def _grid(table: np.ndarray):
+    # Everything interpolate() needs about a table's shape, worked out once per shape: the last grid coordinate and
+    # the last cell along each axis, the C-order strides and the cell's corners as flat offsets.
+    shape = table.shape
+    if shape not in _GRIDS:
+        upper = np.array(shape, dtype=float) - 1
+        strides = np.array(_c_order_strides(shape))
+        _GRIDS[shape] = (upper, (upper - 1).astype(int), strides, _corner_offsets(table.ndim) @ strides)
+    return _GRIDS[shape]
+
+
+def _flat_corner_offsets(table: np.ndarray):
+    # The same corners as flat offsets into table.ravel(), in the same order.
+    shape = table.shape
+    if shape not in _FLAT_CORNER_OFFSETS:
+        _FLAT_CORNER_OFFSETS[shape] = (_corner_offsets(table.ndim) @ np.array(_c_order_strides(shape))).tolist()
+    return _FLAT_CORNER_OFFSETS[shape]
+
+
+def _c_order_strides(shape):
+    # How far apart neighbours along each axis are in table.ravel(), counted in elements.
+    strides = []
+    step = 1
+    for size in reversed(shape):
+        strides.append(step)
+        step *= size
+    return strides[::-1]
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from util.vec import Vec3
 
 
@@ -12,9 +14,19 @@ class Orientation:
     """
 
     def __init__(self, rotation):
-        self.yaw = float(rotation.yaw)
-        self.roll = float(rotation.roll)
-        self.pitch = float(rotation.pitch)
+        self._set_angles(float(rotation.pitch), float(rotation.yaw), float(rotation.roll))
+
+    @classmethod
+    def from_angles(cls, pitch: float, yaw: float, roll: float) -> 'Orientation':
+        """Builds an Orientation from plain angles, for when there is no Rotator object at hand."""
+        ori = cls.__new__(cls)
+        ori._set_angles(pitch, yaw, roll)
+        return ori
+
+    def _set_angles(self, pitch: float, yaw: float, roll: float):
+        self.yaw = yaw
+        self.roll = roll
+        self.pitch = pitch
 
         cr = math.cos(self.roll)
         sr = math.sin(self.roll)
@@ -23,9 +35,46 @@ class Orientation:
         cy = math.cos(self.yaw)
         sy = math.sin(self.yaw)
 
-        self.forward = Vec3(cp * cy, cp * sy, sp)
-        self.right = Vec3(cy*sp*sr-cr*sy, sy*sp*sr+cr*cy, -cp*sr)
-        self.up = Vec3(-cr*cy*sp-sr*sy, -cr*sy*sp+sr*cy, cp*cr)
+        self.forward = Vec3.from_xyz(cp * cy, cp * sy, sp)
+        self.right = Vec3.from_xyz(cy*sp*sr-cr*sy, sy*sp*sr+cr*cy, -cp*sr)
+        self.up = Vec3.from_xyz(-cr*cy*sp-sr*sy, -cr*sy*sp+sr*cy, cp*cr)
+        self._matrix = None
+
+    def matrix(self) -> np.ndarray:
+        """
+        The (3, 3) rotation matrix with forward, right and up as its rows, for use with relative_locations(). It's
+        built on the first call and shared after that, so it is read-only.
+        """
+        if self._matrix is None:
+            forward, right, up = self.forward, self.right, self.up
+            matrix = np.array([(forward.x, forward.y, forward.z), (right.x, right.y, right.z), (up.x, up.y, up.z)])
+            matrix.flags.writeable = False
+            self._matrix = matrix
+        return self._matrix
+
+
+def rotation_matrices(rotations) -> np.ndarray:
+    """
+    Orientation for many objects at once. rotations is (N, 3) of (pitch, yaw, roll), like PacketViews.car_rotations.
+    Returns (N, 3, 3) with the forward, right and up of each object as the rows, the same values Orientation has.
+
+    For the handful of cars in a match, building an Orientation per car is cheaper; this pays off once there are
+    dozens of rotations, e.g. candidate landing orientations.
+    """
+    angles = np.asarray(rotations, dtype=float).reshape(-1, 3)
+    cp, cy, cr = np.cos(angles).T
+    sp, sy, sr = np.sin(angles).T
+    matrices = np.empty((len(angles), 3, 3))
+    matrices[:, 0, 0] = cp * cy
+    matrices[:, 0, 1] = cp * sy
+    matrices[:, 0, 2] = sp
+    matrices[:, 1, 0] = cy*sp*sr - cr*sy
+    matrices[:, 1, 1] = sy*sp*sr + cr*cy
+    matrices[:, 1, 2] = -cp * sr
+    matrices[:, 2, 0] = -cr*cy*sp - sr*sy
+    matrices[:, 2, 1] = -cr*sy*sp + sr*cy
+    matrices[:, 2, 2] = cp * cr
+    return matrices
 
 
 # Sometimes things are easier, when everything is seen from your point of view.
@@ -41,7 +90,19 @@ def relative_location(center: Vec3, ori: Orientation, target: Vec3) -> Vec3:
     * y: how far right
     * z: how far above
     """
-    x = (target - center).dot(ori.forward)
-    y = (target - center).dot(ori.right)
-    z = (target - center).dot(ori.up)
-    return Vec3(x, y, z)
+    offset = target - center
+    return Vec3.from_xyz(offset.dot(ori.forward), offset.dot(ori.right), offset.dot(ori.up))
+
+
+def relative_locations(centers, matrices, targets) -> np.ndarray:
+    """
+    relative_location for many targets, and optionally many points of view, in one call. targets is (M, 3).
+
+    * One point of view: centers is (3,) and matrices is (3, 3) (see Orientation.matrix()). Returns (M, 3).
+    * N points of view: centers is (N, 3) and matrices is (N, 3, 3) (see rotation_matrices()). Returns (N, M, 3),
+      every target as seen from every center.
+
+    The last axis is (in front, right, above), like the x, y and z of relative_location.
+    """
+    offsets = np.asarray(targets, dtype=float) - np.asarray(centers, dtype=float)[..., None, :]
+    return np.einsum('...ij,...mj->...mi', matrices, offsets)
@@ -0,0 +1,140 @@
+import ctypes
+
+import numpy as np
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket, Physics, PlayerInfo, BallInfo, \
+    Touch, BoostPadState, BoostPad
+
+# NumPy descriptions of the RLBot ctypes structures. Offsets and sizes are read from the ctypes classes themselves,
+# so these stay correct as long as the struct layout does. Only the fields we actually use are named; everything
+# else is skipped over as padding.
+#
+# Rotations are stored as (pitch, yaw, roll), in that order, like Rotator.
+
+_VEC3 = ('f4', (3,))
+
+
+def _struct_dtype(struct, fields):
+    """Builds a dtype for a ctypes Structure from (name, ctypes field, numpy format) tuples."""
+    return np.dtype({
+        'names': [name for name, _, _ in fields],
+        'formats': [fmt for _, _, fmt in fields],
+        'offsets': [field.offset for _, field, _ in fields],
+        'itemsize': ctypes.sizeof(struct),
+    })
+
+
+PHYSICS_DTYPE = _struct_dtype(Physics, [
+    ('location', Physics.location, _VEC3),
+    ('rotation', Physics.rotation, _VEC3),
+    ('velocity', Physics.velocity, _VEC3),
+    ('angular_velocity', Physics.angular_velocity, _VEC3),
+])
+
+CAR_DTYPE = _struct_dtype(PlayerInfo, [
+    ('physics', PlayerInfo.physics, PHYSICS_DTYPE),
+    ('is_demolished', PlayerInfo.is_demolished, '?'),
+    ('has_wheel_contact', PlayerInfo.has_wheel_contact, '?'),
+    ('is_super_sonic', PlayerInfo.is_super_sonic, '?'),
+    ('jumped', PlayerInfo.jumped, '?'),
+    ('double_jumped', PlayerInfo.double_jumped, '?'),
+    ('team', PlayerInfo.team, 'u1'),
+    ('boost', PlayerInfo.boost, 'i4'),
+])
+
+BALL_DTYPE = np.dtype({
+    'names': ['physics', 'touch_time', 'touch_player_index'],
+    'formats': [PHYSICS_DTYPE, 'f4', 'i4'],
+    'offsets': [BallInfo.physics.offset,
+                BallInfo.latest_touch.offset + Touch.time_seconds.offset,
+                BallInfo.latest_touch.offset + Touch.player_index.offset],
+    'itemsize': ctypes.sizeof(BallInfo),
+})
+
+BOOST_PAD_STATE_DTYPE = _struct_dtype(BoostPadState, [
+    ('is_active', BoostPadState.is_active, '?'),
+    ('timer', BoostPadState.timer, 'f4'),
+])
+
+BOOST_PAD_DTYPE = _struct_dtype(BoostPad, [
+    ('location', BoostPad.location, _VEC3),
+    ('is_full_boost', BoostPad.is_full_boost, '?'),
+])
+
+SLICE_DTYPE = _struct_dtype(Slice, [
+    ('physics', Slice.physics, PHYSICS_DTYPE),
+    ('game_seconds', Slice.game_seconds, 'f4'),
+])
+
+
+class PacketViews:
+    """
+    NumPy views straight onto the memory of a GameTickPacket. Nothing is copied: reading a column like
+    `car_locations` just reinterprets the bytes RLBot already wrote, so it costs the same whether there are 2 cars or 8.
+
+    RLBot reuses a single packet object and overwrites it in place every tick, so these views are created once and
+    always show the latest values. That also means anything you want to keep across ticks must be copied out first.
+    Use packet_views() to get the views for a packet rather than constructing this directly.
+    """
+    __slots__ = [
+        'packet',
+        'all_cars',
+        'all_boost_pads',
+        'ball',
+    ]
+
+    def __init__(self, packet: GameTickPacket):
+        self.packet = packet
+        self.all_cars = np.frombuffer(packet.game_cars, dtype=CAR_DTYPE)
+        self.all_boost_pads = np.frombuffer(packet.game_boosts, dtype=BOOST_PAD_STATE_DTYPE)
+        self.ball = np.frombuffer(packet.game_ball, dtype=BALL_DTYPE)[0]
+
+    @property
+    def cars(self) -> np.ndarray:
+        """(num_cars,) structured view of every car in the match."""
+        return self.all_cars[:self.packet.num_cars]
+
+    @property
+    def car_locations(self) -> np.ndarray:
+        """(num_cars, 3) view of every car location."""
+        return self.cars['physics']['location']
+
+    @property
+    def car_velocities(self) -> np.ndarray:
+        """(num_cars, 3) view of every car velocity."""
+        return self.cars['physics']['velocity']
+
+    @property
+    def car_rotations(self) -> np.ndarray:
+        """(num_cars, 3) view of every car rotation as (pitch, yaw, roll)."""
+        return self.cars['physics']['rotation']
+
+    @property
+    def boost_pads(self) -> np.ndarray:
+        """(num_boost,) structured view of every boost pad's is_active and timer."""
+        return self.all_boost_pads[:self.packet.num_boost]
+
+
+_last_views: PacketViews = None
+
+
+def packet_views(packet: GameTickPacket) -> PacketViews:
+    """
+    Returns the PacketViews for this packet. Since RLBot hands us the same packet object every tick, the views are
+    only built the first time we see a packet and then reused.
+    """
+    global _last_views
+    if _last_views is None or _last_views.packet is not packet:
+        _last_views = PacketViews(packet)
+    return _last_views
+
+
+def prediction_slices(ball_prediction: BallPrediction) -> np.ndarray:
+    """(num_slices,) structured view of the slices in a BallPrediction, sharing its memory."""
+    return np.frombuffer(ball_prediction.slices, dtype=SLICE_DTYPE, count=ball_prediction.num_slices)
+
+
+def field_boost_pads(field_info: FieldInfoPacket) -> np.ndarray:
+    """(num_boosts,) structured view of the boost pad locations in a FieldInfoPacket, sharing its memory."""
+    return np.frombuffer(field_info.boost_pads, dtype=BOOST_PAD_DTYPE, count=field_info.num_boosts)
@@ -1,3 +1,8 @@
+import math
+
+import numpy as np
+
+from util.drive_model import default_drive_table
 from util.vec import Vec3
 
 class PositionPredictor:
@@ -19,15 +24,31 @@ class PositionPredictor:
         return predicted
 
     @staticmethod
-    def time_to_reach(car_location, car_velocity, target_location, max_speed=2300):
+    def time_to_reach(car_location, car_velocity, target_location, max_speed=2300, car_forward=None, boost=0):
+        """
+        Estimates time to reach a target location on the ground using the precomputed drive-time table, which
+        accounts for accelerating (with boost while it lasts) and turning at speed. Without car_forward we assume
+        the car is already facing the target.
+        """
+        to_target = (target_location - car_location).flat()
+        angle = 0.0
+        if car_forward is not None:
+            angle = math.atan2(car_forward.x * to_target.y - car_forward.y * to_target.x,
+                               car_forward.x * to_target.x + car_forward.y * to_target.y)
+        speed = min(car_velocity.length(), max_speed)
+        return default_drive_table().time_to_reach(speed, to_target.length(), angle, boost)
+
+    @staticmethod
+    def times_to_reach(car_location, car_velocity, car_forward, boost, targets: np.ndarray, max_speed=2300):
         """
-        Estimates time to reach a target location, assuming constant velocity up to max_speed.
+        Vectorized time_to_reach for many targets at once. targets is an (N, 3) array; returns an (N,) array.
         """
-        dist = car_location.dist(target_location)
+        offset = np.asarray(targets)[..., :2] - (car_location.x, car_location.y)
+        distance = np.hypot(offset[..., 0], offset[..., 1])
+        angle = np.arctan2(car_forward.x * offset[..., 1] - car_forward.y * offset[..., 0],
+                           car_forward.x * offset[..., 0] + car_forward.y * offset[..., 1])
         speed = min(car_velocity.length(), max_speed)
-        if speed < 100:
-            speed = 400  # Assume some acceleration from a stop
-        return dist / speed
+        return default_drive_table().time_to_reach(speed, distance, angle, boost)
 
     @staticmethod
     def will_arrive_before(car_location, car_velocity, target_location, target_time, max_speed=2300):
@@ -0,0 +1,101 @@
+from typing import Tuple
+
+import numpy as np
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
+
+from util.packet_views import prediction_slices
+
+
+class PredictionArrays:
+    """
+    The ball prediction as NumPy arrays, so a question about the whole prediction becomes one vectorized mask
+    instead of a Python loop over up to 360 slices. Build it once per tick and share it between every query that
+    needs the prediction.
+
+    * times: (N,) game_seconds of each slice
+    * locations: (N, 3) ball location of each slice
+    * velocities: (N, 3) ball velocity of each slice
+
+    These are float32 views straight onto the BallPrediction struct (see util/packet_views.py), so building this
+    copies nothing. The flip side is that they change when RLBot refills the struct; copy what you need to keep.
+    The original struct is kept so queries can still hand back a real Slice.
+    """
+    __slots__ = [
+        'ball_prediction',
+        'num_slices',
+        'times',
+        'locations',
+        'velocities',
+    ]
+
+    def __init__(self, ball_prediction: BallPrediction):
+        slices = prediction_slices(ball_prediction)
+        physics = slices['physics']
+        self.ball_prediction = ball_prediction
+        self.num_slices = len(slices)
+        self.times = slices['game_seconds']
+        self.locations = physics['location']
+        self.velocities = physics['velocity']
+
+    def slice(self, index: int) -> Slice:
+        """Returns the raw Slice at the given index."""
+        return self.ball_prediction.slices[index]
+
+    def first_slice(self, mask: np.ndarray):
+        """Returns the first Slice where mask is True, or None if there is none."""
+        index = first_index(mask)
+        if index < 0:
+            return None
+        return self.ball_prediction.slices[index]
+
+    def sample(self, times) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ball location and velocity at any game times, not just on slices. Takes an array of times (or one time) and
+        returns location and velocity arrays of its shape plus a last axis of 3, in one vectorized pass.
+
+        Between two slices the location follows the cubic Hermite curve through both slices' locations with their
+        velocities as tangents, and the velocity is that curve's derivative. That reproduces a free-flight arc
+        exactly, unlike rounding to a slice as find_slice_at_time does. Times outside the prediction are clamped to
+        its first or last slice.
+        """
+        times = np.asarray(times, dtype=float)
+        shape = times.shape + (3,)
+        if self.num_slices < 2:
+            if self.num_slices == 0:
+                raise ValueError('The ball prediction is empty')
+            return (np.broadcast_to(self.locations[0], shape).astype(float),
+                    np.broadcast_to(self.velocities[0], shape).astype(float))
+
+        slice_times = self.times
+        t = np.minimum(np.maximum(times.ravel(), slice_times[0]), slice_times[-1])
+        i = np.minimum(np.searchsorted(slice_times, t, side='right') - 1, self.num_slices - 2)
+        t0 = slice_times[i]
+        h = (slice_times[i + 1] - t0)[:, None].astype(float)
+        s = (t[:, None] - t0[:, None]) / h
+        p0 = self.locations[i].astype(float)
+        m0 = self.velocities[i] * h
+        m1 = self.velocities[i + 1] * h
+
+        # The Hermite curve as p0 + m0 s + c2 s^2 + c3 s^3.
+        d = self.locations[i + 1] - p0
+        c2 = 3 * d - 2 * m0 - m1
+        c3 = m0 + m1 - 2 * d
+        location = p0 + s * (m0 + s * (c2 + s * c3))
+        velocity = (m0 + s * (2 * c2 + 3 * s * c3)) / h
+        return location.reshape(shape), velocity.reshape(shape)
+
+    def distances_to(self, point) -> np.ndarray:
+        """Returns the (N,) distance from point to the ball location in every slice."""
+        offset = self.locations - np.array((point.x, point.y, point.z))
+        return np.sqrt(np.einsum('ij,ij->i', offset, offset))
+
+
+def first_index(mask: np.ndarray) -> int:
+    """Returns the index of the first True entry in a boolean array, or -1 if there is none."""
+    if mask.size == 0:
+        return -1
+    index = int(np.argmax(mask))
+    if not mask[index]:
+        return -1
+    return index
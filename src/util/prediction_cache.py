@@ -0,0 +1,201 @@
+import math
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rlbot.agents.base_agent import BaseAgent
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.ball_predictor import find_best_intercept, find_shot_opportunity, solve_arc_intercept, solve_intercepts
+from util.bounds_pyramid import ABS_VZ, VY, Z, BoundsPyramid, above, below, prediction_channels, shift_channels
+from util.prediction_arrays import PredictionArrays
+from util.prediction_events import PredictionEvents
+from util.prediction_scan import PredictionScan
+from util.vec import Vec3
+
+# Predictions have 60 slices per second.
+SLICES_PER_SECOND = 60
+# Two predictions count as the same one shifted if their shared slices agree to within this (uu and uu/s).
+SHIFT_TOLERANCE = 1.0
+# How far (in slices) the start of the prediction may be from a whole number of slices after the last one's. Slice
+# times are float32, which late in a long game only resolves them to a few hundredths of a slice, while a real shift
+# is always close to a whole number.
+SHIFT_STEP_TOLERANCE = 0.25
+
+# The slice-by-slice questions PredictionCache answers itself, all in one scan. Same tests as find_next_ground_touch
+# and find_shot_opportunity (with its default min_speed of 400).
+SUMMARY_SCAN = PredictionScan()
+SUMMARY_SCAN.first('ground_touch', [(Z, -math.inf, below(150)), (ABS_VZ, -math.inf, below(100))])
+SUMMARY_SCAN.first('shot_toward_orange', [(VY, above(400), math.inf), (Z, -math.inf, below(300))])
+SUMMARY_SCAN.first('shot_toward_blue', [(VY, -math.inf, below(-400)), (Z, -math.inf, below(300))])
+
+
+class PredictionCache:
+    """
+    Fetches the ball prediction at most once per game frame and remembers everything we derive from it.
+
+    Call update() once per tick. It only goes to shared memory when the packet's frame number changes, and it only
+    throws away the remembered analyses when the prediction itself changed, which we detect from the first slice's
+    game_seconds. Until then, asking for the same analysis again (ground touch, goal, an intercept with the same
+    inputs) is a dictionary lookup. hits and misses count those lookups so you can see how well it's working.
+
+    While nobody touches the ball, each new prediction is usually the last one moved forward by a slice or two.
+    update() checks for that (same latest touch, and the first and last shared slices still agree, which catches the
+    tail diverging after a bounce) and sets shift to the number of slices it moved, or None. Analyses that know how to
+    shift themselves then start from the previous prediction's result and only look at the new slices at the end;
+    see memoize(). Everything else, and everything after a touch, is computed from scratch. reuses counts the shifted
+    results.
+    """
+
+    def __init__(self):
+        self.prediction: PredictionArrays = None
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.reuses = 0
+        self.shift: Optional[int] = None
+        self._frame: int = None
+        self._key: Tuple = None
+        self._analyses: Dict[Hashable, object] = {}
+        self._previous: Dict[Hashable, object] = {}
+        # Copies of the last prediction and the ball's latest touch time, to tell whether the next one is a shift.
+        self._last_locations: np.ndarray = None
+        self._last_velocities: np.ndarray = None
+        self._last_start: float = None
+        self._touch_time: float = None
+
+    def update(self, agent: BaseAgent, packet: GameTickPacket) -> PredictionArrays:
+        frame = packet.game_info.frame_num
+        if frame == self._frame and self.prediction is not None:
+            return self.prediction
+        self._frame = frame
+
+        ball_prediction = agent.get_ball_prediction_struct()
+        self.fetches += 1
+        num_slices = ball_prediction.num_slices
+        start_time = ball_prediction.slices[0].game_seconds if num_slices > 0 else None
+        key = (id(ball_prediction), num_slices, start_time)
+        if key != self._key:
+            # RLBot refills the same struct in place, so the views inside PredictionArrays are already current. We
+            # still rebuild it when the struct or its length changes, and always forget the old analyses.
+            if self.prediction is None or key[:2] != self._key[:2]:
+                self.prediction = PredictionArrays(ball_prediction)
+            self._key = key
+            self.shift = self._find_shift(packet.game_ball.latest_touch.time_seconds)
+            self._previous = self._analyses if self.shift is not None else {}
+            self._analyses = {}
+        return self.prediction
+
+    def _find_shift(self, touch_time: float) -> Optional[int]:
+        # How many slices the new prediction moved forward from the last one, if it's the same one moved forward.
+        prediction = self.prediction
+        last_locations = self._last_locations
+        last_velocities = self._last_velocities
+        last_start = self._last_start
+        count = prediction.num_slices
+        shift = None
+        if count > 0 and last_locations is not None and len(last_locations) == count \
+                and touch_time == self._touch_time:
+            steps = (float(prediction.times[0]) - last_start) * SLICES_PER_SECOND
+            shift = round(steps)
+            if not 0 < shift < count or abs(steps - shift) > SHIFT_STEP_TOLERANCE:
+                shift = None
+            else:
+                # Slice i now was slice i + shift before. Errors grow along the prediction, so the last shared slice
+                # is the one to check.
+                for now, before in ((0, shift), (count - 1 - shift, count - 1)):
+                    state = prediction.locations[now].tolist() + prediction.velocities[now].tolist()
+                    last_state = last_locations[before].tolist() + last_velocities[before].tolist()
+                    if any(abs(a - b) > SHIFT_TOLERANCE for a, b in zip(state, last_state)):
+                        shift = None
+                        break
+
+        self._touch_time = touch_time
+        if count > 0:
+            self._last_locations = prediction.locations.copy()
+            self._last_velocities = prediction.velocities.copy()
+            self._last_start = float(prediction.times[0])
+        else:
+            self._last_locations = self._last_velocities = None
+        return shift
+
+    def memoize(self, key: Hashable, compute: Callable[[], object], shift: Callable[[object, int], object] = None):
+        """
+        Returns the remembered result for key if this prediction has one, otherwise computes it, remembers it, and
+        returns it. The key must capture every input besides the prediction itself.
+
+        If the prediction is the previous one shifted and that one had a result for key, shift(previous_result,
+        slices) is tried first. It returns the result for the current prediction, or None to fall back to compute().
+        """
+        analyses = self._analyses
+        if key in analyses:
+            self.hits += 1
+            return analyses[key]
+        self.misses += 1
+        result = None
+        if shift is not None and key in self._previous:
+            result = shift(self._previous[key], self.shift)
+            if result is not None:
+                self.reuses += 1
+        if result is None:
+            result = compute()
+        analyses[key] = result
+        return result
+
+    def channels(self) -> np.ndarray:
+        """The current prediction as one row per slice of the channels in util/bounds_pyramid.py."""
+        return self.memoize('channels', lambda: prediction_channels(self.prediction),
+                            lambda previous, shift: shift_channels(previous, self.prediction, shift))
+
+    def bounds(self) -> BoundsPyramid:
+        """Per-block min/max of the current prediction's slices, for range queries that skip whole blocks."""
+        return self.memoize('bounds', lambda: BoundsPyramid(self.channels()))
+
+    def scan(self, scan: PredictionScan, **points: Vec3) -> Dict[str, int]:
+        """Runs a PredictionScan over the current prediction, once per prediction and set of points."""
+        key = ('scan', scan) + tuple((name, p.x, p.y, p.z) for name, p in sorted(points.items()))
+        return self.memoize(key, lambda: scan.run(self.channels(), self.prediction.locations, points),
+                            lambda previous, shift: scan.shifted(previous, shift, self.channels()))
+
+    def _summary_slice(self, name: str):
+        index = self.scan(SUMMARY_SCAN)[name]
+        return self.prediction.slice(index) if index >= 0 else None
+
+    def next_ground_touch(self):
+        return self._summary_slice('ground_touch')
+
+    def shot_opportunity(self, opponent_goal_y, min_speed=400):
+        """Like find_shot_opportunity, answered from the shared summary scan when min_speed is the default."""
+        if min_speed != 400 or opponent_goal_y == 0:
+            return find_shot_opportunity(self.prediction, opponent_goal_y, min_speed)
+        return self._summary_slice('shot_toward_orange' if opponent_goal_y > 0 else 'shot_toward_blue')
+
+    def events(self) -> PredictionEvents:
+        """Bounces, wall and ceiling contacts, goal entry and free-flight segments of the current prediction."""
+        return self.memoize('events', lambda: PredictionEvents(self.prediction),
+                            lambda previous, shift: previous.shifted(self.prediction, shift))
+
+    def future_goal(self):
+        goal = self.events().goal
+        return self.prediction.slice(goal.index) if goal is not None else None
+
+    def best_intercept(self, car_location: Vec3, car_speed: float, min_height=0, max_height=300):
+        key = ('intercept', car_location.x, car_location.y, car_location.z, car_speed, min_height, max_height)
+        return self.memoize(key, lambda: find_best_intercept(car_location, car_speed, self.prediction,
+                                                             min_height=min_height, max_height=max_height,
+                                                             events=self.events()))
+
+    def arc_intercept(self, car_location: Vec3, car_speed: float, min_height=0, max_height=300):
+        """Like best_intercept, but with the exact time and ball state rather than a slice. See solve_arc_intercept."""
+        key = ('arc_intercept', car_location.x, car_location.y, car_location.z, car_speed, min_height, max_height)
+        return self.memoize(key, lambda: solve_arc_intercept(car_location, car_speed, self.prediction, self.events(),
+                                                             min_height, max_height))
+
+    def intercepts(self, car_location: Vec3, car_speed: float, bands: Sequence[Tuple[float, float]], max_time=None,
+                   car_forward: Vec3 = None, boost=0):
+        bands = tuple(bands)
+        key = ('intercepts', car_location.x, car_location.y, car_location.z, car_speed, bands, max_time)
+        if car_forward is not None:
+            key += (car_forward.x, car_forward.y, boost)
+        return self.memoize(key, lambda: solve_intercepts(car_location, car_speed, self.prediction, bands,
+                                                          max_time=max_time, car_forward=car_forward, boost=boost))
@@ -0,0 +1,191 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.prediction_arrays import PredictionArrays, first_index
+from util.vec import Vec3
+
+GRAVITY = -650
+# Air drag on the ball, as a fraction of its velocity lost per second.
+BALL_DRAG = 0.0305
+# A change in velocity between slices that free flight doesn't explain by more than this (uu/s) means the ball hit
+# something. Well under the 10.8 uu/s gravity adds per slice, so a ball rolling along a surface counts as touching it.
+CONTACT_THRESHOLD = 5.0
+
+# Below this height a contact pushing the ball up is the floor, above CEILING_HEIGHT one pushing it down is the
+# ceiling. Everything else (side and back walls, corners, goal posts) counts as a wall.
+FLOOR_HEIGHT = 300
+CEILING_HEIGHT = 1700
+
+FLOOR = 'floor'
+WALL = 'wall'
+CEILING = 'ceiling'
+GOAL = 'goal'
+
+
+@dataclass
+class PredictionEvent:
+    kind: str  # FLOOR, WALL, CEILING or GOAL
+    index: int  # First slice after the contact, or the first slice inside the goal
+    time: float  # game_seconds of that slice
+    location: Vec3
+    velocity: Vec3  # Velocity coming out of the contact
+
+
+class PredictionEvents:
+    """
+    Everything that happens to the ball in one prediction, found in a single vectorized pass when the prediction
+    changes. Share it through PredictionCache.events() so every state asks the same object.
+
+    A contact is a step between slices whose velocity change isn't gravity plus drag. Consecutive contact steps (a
+    ball rolling along a surface) are one event, classified by where it happens and which way it pushed the ball.
+    The first slice inside a goal is a GOAL event. Events are in time order.
+
+    The slices between contacts are free flight. Those runs are the segments: segment k covers slices
+    segment_starts[k] to segment_ends[k] inclusive, and within it the ball follows a parabola (less a little drag).
+    segment_of_slice maps any slice to its segment.
+
+    When the next prediction is this one moved forward by a few slices, shifted() builds its events from these,
+    checking only the steps at the new end for contacts.
+    """
+
+    def __init__(self, prediction: PredictionArrays):
+        self.prediction = prediction
+        count = prediction.num_slices
+
+        # Per step, kept for shifted(): whether the ball hit something, and the vertical part of the push it got.
+        self._contact, self._push_z = contact, push_z = _find_contacts(prediction, 0)
+
+        # Step i is between slices i and i + 1. An event starts at each run of contact steps.
+        starts = contact.copy()
+        starts[1:] &= ~contact[:-1]
+        steps = np.flatnonzero(starts)
+        events = [self._contact_event(step, push) for step, push in zip(steps.tolist(), push_z[steps].tolist())]
+        self._set_events(events, first_index(np.abs(prediction.locations[:, 1]) >= GOAL_THRESHOLD))
+
+        # A new segment starts at slice 0 and after every contact step.
+        boundary = np.zeros(count, dtype=bool)
+        if count > 0:
+            boundary[0] = True
+            boundary[1:] = contact
+        self.segment_of_slice = np.cumsum(boundary) - 1
+        self.segment_starts = np.flatnonzero(boundary)
+        self.segment_ends = np.append(self.segment_starts[1:] - 1, count - 1) if count > 0 else self.segment_starts
+
+    def _event(self, kind: str, index: int) -> PredictionEvent:
+        prediction = self.prediction
+        return PredictionEvent(kind, index, float(prediction.times[index]),
+                               Vec3.from_xyz(*prediction.locations[index].tolist()),
+                               Vec3.from_xyz(*prediction.velocities[index].tolist()))
+
+    def _contact_event(self, step: int, push_z: float) -> PredictionEvent:
+        # The event for a run of contact steps starting at step, classified by height and the vertical push.
+        height = float(self.prediction.locations[step + 1, 2])
+        if push_z > 0 and height < FLOOR_HEIGHT:
+            kind = FLOOR
+        elif push_z < 0 and height > CEILING_HEIGHT:
+            kind = CEILING
+        else:
+            kind = WALL
+        return self._event(kind, step + 1)
+
+    def _set_events(self, events: List[PredictionEvent], goal_index: int):
+        # events are the contact events in order. Slots the goal in and indexes the first event of each kind.
+        if goal_index >= 0:
+            position = bisect_left([event.index for event in events], goal_index)
+            events.insert(position, self._event(GOAL, goal_index))
+        self.events = events
+        self._first: Dict[str, PredictionEvent] = {}
+        for event in events:
+            self._first.setdefault(event.kind, event)
+
+    def shifted(self, prediction: PredictionArrays, shift: int) -> 'PredictionEvents':
+        """
+        The events of prediction, which must be this prediction moved forward by shift slices (see
+        PredictionCache.shift). Events, contact tests and segments on the slices both predictions share are carried
+        over with their indices moved, so only the last shift slices are examined.
+        """
+        count = prediction.num_slices
+        tail = count - shift  # First new slice
+        if tail < 2:
+            return PredictionEvents(prediction)
+        # Steps tail - 1 onwards end on a new slice.
+        tail_contact, tail_push_z = _find_contacts(prediction, tail - 1)
+        shifted = PredictionEvents.__new__(PredictionEvents)
+        shifted.prediction = prediction
+        shifted._contact = contact = np.concatenate((self._contact[shift:], tail_contact))
+        shifted._push_z = np.concatenate((self._push_z[shift:], tail_push_z))
+
+        events = []
+        # A contact still going on where the old prediction was cut starts a new event at step 0.
+        if contact[0] and self._contact[shift - 1]:
+            events.append(shifted._contact_event(0, float(shifted._push_z[0])))
+        for event in self.events:
+            if event.kind != GOAL and event.index > shift:
+                events.append(PredictionEvent(event.kind, event.index - shift, event.time, event.location,
+                                              event.velocity))
+        previous = bool(contact[tail - 2])
+        for step, (hit, push_z) in enumerate(zip(tail_contact.tolist(), tail_push_z.tolist()), tail - 1):
+            if hit and not previous:
+                events.append(shifted._contact_event(step, push_z))
+            previous = hit
+
+        goal = self._first.get(GOAL)
+        if goal is None:
+            goal_index = first_index(np.abs(prediction.locations[tail:, 1]) >= GOAL_THRESHOLD)
+            goal_index = tail + goal_index if goal_index >= 0 else -1
+        elif goal.index >= shift:
+            goal_index = goal.index - shift
+        else:
+            goal_index = first_index(np.abs(prediction.locations[:, 1]) >= GOAL_THRESHOLD)
+        shifted._set_events(events, goal_index)
+
+        # Slice i now is slice i + shift before, and starts a segment if that one did.
+        segment_of_slice = self.segment_of_slice
+        base = segment_of_slice[shift]
+        shifted.segment_of_slice = np.concatenate((segment_of_slice[shift:] - base,
+                                                   segment_of_slice[-1] - base + np.cumsum(tail_contact)))
+        starts = self.segment_starts
+        shifted.segment_starts = np.concatenate(([0], starts[starts > shift] - shift,
+                                                 tail + np.flatnonzero(tail_contact)))
+        shifted.segment_ends = np.append(shifted.segment_starts[1:] - 1, count - 1)
+        return shifted
+
+    def first(self, kind: str) -> Optional[PredictionEvent]:
+        """The earliest event of the given kind, or None."""
+        return self._first.get(kind)
+
+    @property
+    def next_bounce(self) -> Optional[PredictionEvent]:
+        return self._first.get(FLOOR)
+
+    @property
+    def next_wall_touch(self) -> Optional[PredictionEvent]:
+        return self._first.get(WALL)
+
+    @property
+    def goal(self) -> Optional[PredictionEvent]:
+        """When and where the ball goes in, if it does."""
+        return self._first.get(GOAL)
+
+    def events_after(self, time: float) -> List[PredictionEvent]:
+        """Events strictly after the given game time."""
+        return [event for event in self.events if event.time > time]
+
+
+def _find_contacts(prediction: PredictionArrays, first_step: int):
+    # Contact test for the steps from first_step to the end: whether each one hit something, and the vertical part of
+    # the push it got.
+    first_step = max(first_step, 0)
+    times = prediction.times[first_step:]
+    velocities = prediction.velocities[first_step:]
+    if len(times) < 2:
+        return np.zeros(0, dtype=bool), np.zeros(0)
+    dt = np.diff(times)[:, None]
+    expected = velocities[:-1] * (1 - BALL_DRAG * dt)
+    expected[:, 2] += GRAVITY * dt[:, 0]
+    residual = velocities[1:] - expected
+    return np.einsum('ij,ij->i', residual, residual) > CONTACT_THRESHOLD ** 2, residual[:, 2]
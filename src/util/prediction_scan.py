@@ -0,0 +1,144 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from util.bounds_pyramid import TIME, Condition
+from util.vec import Vec3
+
+FIRST = 'first'
+LAST = 'last'
+COUNT = 'count'
+CLOSEST = 'closest'
+
+ALWAYS: Condition = (TIME, -math.inf, math.inf)
+
+
+class PredictionScan:
+    """
+    A fixed set of named questions about the ball prediction, answered together in one pass over the slices.
+
+    Register every question once, up front (at import time or in __init__), then run the scan each tick, usually
+    through PredictionCache.scan() so it runs at most once per prediction. Each question is a list of conditions
+    (channel, low, high) on the channels in util/bounds_pyramid.py, all of which must hold, plus what to report:
+
+    * first / last: index of the first / last matching slice, or -1
+    * count: how many slices match
+    * closest: index of the matching slice whose ball location is nearest a point, or -1. The point is named when
+      registering and passed to run(), since it usually changes every tick (our car, say).
+
+    run() tests every condition of every question in one vectorized comparison over the (K, N) table of the columns
+    they read, folds each question's conditions together in one reduction, and measures the distances for every
+    closest question at once. The slices are read once however many questions there are.
+
+    find_matching_slice in ball_prediction_analysis.py is still the way to ask an arbitrary Python predicate of the
+    raw struct.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._kinds: List[str] = []
+        self._points: List[str] = []
+        self._conditions: List[List[Condition]] = []
+        self._compiled = None
+
+    def first(self, name: str, conditions: Sequence[Condition]) -> None:
+        self._add(name, FIRST, conditions)
+
+    def last(self, name: str, conditions: Sequence[Condition]) -> None:
+        self._add(name, LAST, conditions)
+
+    def count(self, name: str, conditions: Sequence[Condition]) -> None:
+        self._add(name, COUNT, conditions)
+
+    def closest(self, name: str, point: str, conditions: Sequence[Condition] = ()) -> None:
+        self._add(name, CLOSEST, conditions, point)
+
+    def _add(self, name: str, kind: str, conditions: Sequence[Condition], point: str = None):
+        if name in self.names:
+            raise ValueError(f"A question named '{name}' is already registered")
+        self.names.append(name)
+        self._kinds.append(kind)
+        self._points.append(point)
+        self._conditions.append(list(conditions))
+        self._compiled = None
+
+    def _compile(self):
+        # Pad every question to the same number of conditions with one that always holds, so the (K, N) test table
+        # folds into (Q, N) matches with a plain all() rather than a reduceat.
+        width = max(max(len(conditions) for conditions in self._conditions), 1)
+        padded = [conditions + [ALWAYS] * (width - len(conditions)) for conditions in self._conditions]
+        channels, lows, highs = (np.array(column) for column in zip(*(c for conditions in padded for c in conditions)))
+        # The channels are float32. Rounding each bound inwards to float32 gives the same answers as comparing in
+        # float64, and keeps the comparisons from upcasting the whole table.
+        lows32 = lows.astype(np.float32)
+        lows32 = np.where(lows32 < lows, np.nextafter(lows32, np.float32(np.inf)), lows32)
+        highs32 = highs.astype(np.float32)
+        highs32 = np.where(highs32 > highs, np.nextafter(highs32, np.float32(-np.inf)), highs32)
+        kinds = np.array(self._kinds)
+        closest = np.flatnonzero(kinds == CLOSEST)
+        self._compiled = (width, channels.astype(int), lows32[:, None], highs32[:, None], kinds == FIRST,
+                          kinds == COUNT, closest, [self._points[q] for q in closest.tolist()])
+        return self._compiled
+
+    def run(self, values: np.ndarray, locations: np.ndarray, points: Dict[str, Vec3] = None) -> Dict[str, int]:
+        """
+        Answers every question. values is the prediction's float32 channel table (prediction_channels(), or
+        PredictionCache.channels()) and locations its (N, 3) ball locations. points gives each point named by a
+        closest question. Returns {name: answer}.
+        """
+        if not self.names:
+            return {}
+        width, channels, lows, highs, is_first, is_count, closest, point_names = self._compiled or self._compile()
+        count = len(values)
+        if count == 0:
+            return {name: 0 if kind == COUNT else -1 for name, kind in zip(self.names, self._kinds)}
+
+        columns = values.T[channels]
+        passed = (columns >= lows) & (columns <= highs)
+        # (Q, N): whether each question matches each slice.
+        matches = passed.reshape(len(self.names), width, count).all(axis=1)
+
+        found = matches.any(axis=1)
+        firsts = matches.argmax(axis=1)
+        lasts = count - 1 - matches[:, ::-1].argmax(axis=1)
+        answers = np.where(found, np.where(is_first, firsts, lasts), -1)
+        if is_count.any():
+            answers[is_count] = np.count_nonzero(matches[is_count], axis=1)
+
+        if len(closest):
+            targets = np.array([(p.x, p.y, p.z) for p in (points[name] for name in point_names)])
+            offsets = locations[None, :, :] - targets[:, None, :]
+            distances_sq = np.einsum('pnk,pnk->pn', offsets, offsets)
+            allowed = matches[closest]
+            nearest = np.where(allowed, distances_sq, np.inf).argmin(axis=1)
+            answers[closest] = np.where(found[closest], nearest, -1)
+
+        return dict(zip(self.names, answers.tolist()))
+
+    def shifted(self, previous: Dict[str, int], shift: int, values: np.ndarray) -> Optional[Dict[str, int]]:
+        """
+        The answers for a prediction that is the previous one moved forward by shift slices, from the previous
+        answers and the new rows at the end of values. Returns None if the scan needs the whole prediction: counts
+        and closest questions do, and so does a first match that fell off the front.
+        """
+        if any(kind in (COUNT, CLOSEST) for kind in self._kinds):
+            return None
+        tail_start = len(values) - shift
+        tail = self.run(values[tail_start:], None)
+        answers = {}
+        for name, kind in zip(self.names, self._kinds):
+            old = previous[name]
+            new = tail[name]
+            if kind == FIRST:
+                if old >= shift:
+                    answers[name] = old - shift
+                elif old < 0:
+                    answers[name] = tail_start + new if new >= 0 else -1
+                else:
+                    return None
+            elif new >= 0:
+                answers[name] = tail_start + new
+            else:
+                answers[name] = old - shift if old >= shift else -1
+        return answers
@@ -1,5 +1,6 @@
+from copy import copy
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from rlbot.agents.base_agent import SimpleControllerState
 from rlbot.utils.structures.game_data_struct import GameTickPacket
@@ -40,13 +41,59 @@ class ControlStep(Step):
 
 
 class Sequence:
+    """
+    Runs steps one after another. ControlSteps are timed by the sequence itself: their durations are read once when
+    the sequence is built, and each tick compares the time since the current step started against its duration. That
+    returns the step's own controls object, so ticking them allocates nothing and doesn't depend on ControlStep.tick
+    or its per-step start_time.
+
+    Like ControlStep, every step gets at least one frame and the sequence advances at most one step per tick. When a
+    step ends late (a frame hitch), the next one starts on the frame it first gets rather than being skipped, which
+    matters for short steps such as a one-frame jump release.
+
+    Any other Step is ticked through the Step API exactly as before.
+    """
     def __init__(self, steps: List[Step]):
         self.steps = steps
         self.index = 0
         self.done = False
+        # Each ControlStep's duration, or None for other steps.
+        self._durations: List[Optional[float]] = [step.duration if isinstance(step, ControlStep) else None
+                                                  for step in steps]
+        self._step_start: float = None
+
+    def reset(self):
+        """Rewinds to the first step."""
+        self.index = 0
+        self.done = False
+        self._step_start = None
+
+    def cursor(self) -> 'Sequence':
+        """
+        Returns a new Sequence at the first step that shares this one's steps and durations, so making it copies
+        nothing. Steps are shared too, which is only safe for ControlSteps and custom steps without state.
+        """
+        cursor = copy(self)
+        cursor.reset()
+        return cursor
 
     def tick(self, packet: GameTickPacket):
         while self.index < len(self.steps):
+            duration = self._durations[self.index]
+            if duration is not None:
+                now = packet.game_info.seconds_elapsed
+                if self._step_start is None:
+                    self._step_start = now
+                controls = self.steps[self.index].controls
+                # A step stays active until the elapsed time passes its duration, like ControlStep. It still gets this
+                # frame, then we move on to the next step next frame.
+                if now - self._step_start > duration:
+                    self.index += 1
+                    self._step_start = None
+                    if self.index >= len(self.steps):
+                        self.done = True
+                return controls
+
             step = self.steps[self.index]
             result = step.tick(packet)
             if result is None or result.controls is None or result.done:
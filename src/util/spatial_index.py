@@ -0,0 +1,114 @@
+import math
+from typing import List
+
+import numpy as np
+
+
+class GridIndex:
+    """
+    A uniform 2D grid over a fixed set of points on the field floor (x and y only). Each cell lists the points inside
+    it, stored CSR-style: the indices of cell c are items[starts[c]:starts[c + 1]].
+
+    Queries only visit cells near the query point, so they cost about the same however many points there are.
+    Build one when the points are known and keep it. There is no way to add or move points.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: float = 1024):
+        points = np.asarray(points, dtype=float)[:, :2]
+        self.points = points
+        self.cell_size = cell_size
+        self.origin = points.min(axis=0) if len(points) else np.zeros(2)
+        extent = points.max(axis=0) - self.origin if len(points) else np.zeros(2)
+        self.columns, self.rows = (extent // cell_size).astype(int) + 1
+
+        cells = self._cells_of(points)
+        self.items = np.argsort(cells, kind='stable')
+        self.starts = np.searchsorted(cells[self.items], np.arange(self.columns * self.rows + 1))
+        # Plain lists for the per-query loops, which touch only a handful of entries.
+        self._items = self.items.tolist()
+        self._starts = self.starts.tolist()
+        self._xy = points.tolist()
+
+    def _cells_of(self, points: np.ndarray) -> np.ndarray:
+        column, row = ((points - self.origin) // self.cell_size).astype(int).T
+        return np.clip(row, 0, self.rows - 1) * self.columns + np.clip(column, 0, self.columns - 1)
+
+    def _cell_coords(self, x: float, y: float):
+        return int((x - self.origin[0]) // self.cell_size), int((y - self.origin[1]) // self.cell_size)
+
+    def _ring(self, column: int, row: int, radius: int) -> List[int]:
+        # Indices of the points in the cells exactly `radius` cells away (Chebyshev distance) from (column, row).
+        found = []
+        for r in range(max(row - radius, 0), min(row + radius, self.rows - 1) + 1):
+            edge = r == row - radius or r == row + radius
+            step = 1 if edge else 2 * radius
+            for c in range(column - radius, column + radius + 1, max(step, 1)):
+                if 0 <= c < self.columns:
+                    cell = r * self.columns + c
+                    found.extend(self._items[self._starts[cell]:self._starts[cell + 1]])
+        return found
+
+    def _max_ring(self, column: int, row: int) -> int:
+        # Past this many rings no cell is inside the grid any more.
+        return max(column, self.columns - 1 - column, row, self.rows - 1 - row, 0)
+
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        """Indices of every point within radius of (x, y), in no particular order."""
+        column, row = self._cell_coords(x, y)
+        rings = min(int(radius // self.cell_size) + 1, self._max_ring(column, row))
+        radius_sq = radius * radius
+        xy = self._xy
+        found = []
+        for ring in range(rings + 1):
+            for i in self._ring(column, row, ring):
+                px, py = xy[i]
+                if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                    found.append(i)
+        return found
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[int]:
+        """Indices of the k points closest to (x, y), closest first."""
+        column, row = self._cell_coords(x, y)
+        # How far (x, y) is from the edges of its own cell. Points outside ring r are at least this plus r - 1 cells
+        # away, which tells us when the rings can't turn up anything closer.
+        inset = min(x - self.origin[0] - column * self.cell_size, (column + 1) * self.cell_size - (x - self.origin[0]),
+                    y - self.origin[1] - row * self.cell_size, (row + 1) * self.cell_size - (y - self.origin[1]))
+        inset = max(inset, 0)
+        xy = self._xy
+        candidates = []
+        for ring in range(self._max_ring(column, row) + 1):
+            for i in self._ring(column, row, ring):
+                px, py = xy[i]
+                candidates.append(((px - x) ** 2 + (py - y) ** 2, i))
+            if len(candidates) >= k:
+                candidates.sort()
+                bound = inset + ring * self.cell_size
+                if candidates[k - 1][0] <= bound * bound:
+                    break
+        candidates.sort()
+        return [i for _, i in candidates[:k]]
+
+    def along_path(self, start_x: float, start_y: float, end_x: float, end_y: float, max_detour: float) -> List[int]:
+        """
+        Indices of the points within max_detour of the segment from start to end, ordered by how far along the
+        segment they are.
+        """
+        dx = end_x - start_x
+        dy = end_y - start_y
+        length_sq = dx * dx + dy * dy
+        # Every qualifying point is within half the segment plus max_detour of its midpoint.
+        half = math.sqrt(length_sq) / 2
+        candidates = self.within(start_x + dx / 2, start_y + dy / 2, half + max_detour)
+        detour_sq = max_detour * max_detour
+        xy = self._xy
+        found = []
+        for i in candidates:
+            px, py = xy[i]
+            progress = ((px - start_x) * dx + (py - start_y) * dy) / length_sq if length_sq > 0 else 0.0
+            progress = min(max(progress, 0.0), 1.0)
+            cx = start_x + dx * progress - px
+            cy = start_y + dy * progress - py
+            if cx * cx + cy * cy <= detour_sq:
+                found.append((progress, i))
+        found.sort()
+        return [i for _, i in found]
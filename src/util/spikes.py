@@ -1,6 +1,8 @@
+import numpy as np
 from rlbot.utils.structures.game_data_struct import PlayerInfo, GameTickPacket
 
-from util.vec import Vec3
+from util.packet_views import packet_views
+from util.vec import Vec3, Vec3Array
 
 # When the ball is attached to a car's spikes, the distance will vary a bit depending on whether the ball is
 # on the front bumper, the roof, etc. It tends to be most far away when the ball is on one of the front corners
@@ -17,17 +19,14 @@ class SpikeWatcher:
         self.carry_duration = 0
 
     def read_packet(self, packet: GameTickPacket):
-        ball_location = Vec3(packet.game_ball.physics.location)
+        ball_location = Vec3.from_struct(packet.game_ball.physics.location)
         closest_candidate: PlayerInfo = None
-        closest_distance = 999999
-        for i in range(packet.num_cars):
-            car = packet.game_cars[i]
-            car_location = Vec3(car.physics.location)
-            distance = car_location.dist(ball_location)
-            if distance < MAX_DISTANCE_WHEN_SPIKED:
-                if distance < closest_distance:
-                    closest_candidate = car
-                    closest_distance = distance
+        # Every car's distance to the ball in one go; the closest one wins if it's near enough.
+        distances = Vec3Array(packet_views(packet).car_locations).dist(ball_location)
+        if len(distances) > 0:
+            closest = int(np.argmin(distances))
+            if distances[closest] < MAX_DISTANCE_WHEN_SPIKED:
+                closest_candidate = packet.game_cars[closest]
         if closest_candidate != self.carrying_car and closest_candidate is not None:
             self.spike_moment = packet.game_info.seconds_elapsed
 
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from typing import Callable, Dict
+
+import numpy as np
+
+# Bump this whenever the file layout below changes.
+CACHE_FORMAT_VERSION = 1
+
+# Tables live next to the bot's source by default, so every bot process on the machine finds the same files.
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'table_cache')
+
+_MAGIC = b'GMTB'
+_ALIGNMENT = 64
+
+
+def load_or_build(name: str, parameters: dict, build: Callable[[], Dict[str, np.ndarray]],
+                  cache_dir: str = DEFAULT_CACHE_DIR) -> Dict[str, np.ndarray]:
+    """
+    Returns a set of precomputed tables, memory-mapped from disk if a matching file exists, otherwise built with
+    build() and written out for next time.
+
+    parameters must hold everything that affects the result (physics constants, grid sizes, a model version).
+    The file name includes a hash of them, so changing any parameter means a fresh build, never a stale table.
+
+    The arrays come back as read-only plain ndarray views of numpy.memmap objects. Loading one is just an mmap, so it
+    costs the same no matter how big the table is, and every process that maps the same file shares its pages through
+    the OS page cache. If the cache directory can't be written, the freshly built arrays are returned instead.
+    """
+    key = hashlib.sha1(json.dumps({'format': CACHE_FORMAT_VERSION, 'name': name, 'parameters': parameters},
+                                  sort_keys=True).encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f'{name}-{key}.bin')
+
+    try:
+        return _load(path)
+    except (OSError, ValueError):
+        pass
+
+    arrays = build()
+    try:
+        _write(path, arrays)
+        _remove_stale(cache_dir, name, path)
+        return _load(path)
+    except OSError:
+        return arrays
+
+
+def _load(path: str) -> Dict[str, np.ndarray]:
+    with open(path, 'rb') as f:
+        magic, header_length = struct.unpack('<4sI', f.read(8))
+        if magic != _MAGIC:
+            raise ValueError(f'{path} is not a table cache file')
+        header = json.loads(f.read(header_length))
+    # Hand out plain ndarray views of the maps. They keep the mapping alive, and slicing them skips the memmap
+    # subclass bookkeeping, which is noticeable on small per-tick lookups.
+    return {
+        entry['name']: np.memmap(path, dtype=np.dtype(entry['dtype']), mode='r', offset=entry['offset'],
+                                 shape=tuple(entry['shape'])).view(np.ndarray)
+        for entry in header['arrays']
+    }
+
+
+def _write(path: str, arrays: Dict[str, np.ndarray]):
+    """
+    Layout: magic, header length (uint32), JSON header describing each array, then the raw C-order array bytes, each
+    starting on a 64 byte boundary.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    entries = [{'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape)} for name, array in arrays.items()]
+
+    # The offsets depend on the header size, and the header holds the offsets. Grow until it settles.
+    data_start = 0
+    while True:
+        offset = data_start
+        for entry, array in zip(entries, arrays.values()):
+            entry['offset'] = offset
+            offset = _aligned(offset + array.nbytes)
+        header = json.dumps({'arrays': entries}).encode()
+        needed = _aligned(8 + len(header))
+        if needed == data_start:
+            break
+        data_start = needed
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file and rename it into place, so another bot process never maps a half written table.
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        os.chmod(temp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(struct.pack('<4sI', _MAGIC, len(header)))
+            f.write(header)
+            for entry, array in zip(entries, arrays.values()):
+                f.write(b'\0' * (entry['offset'] - f.tell()))
+                f.write(array.tobytes())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _remove_stale(cache_dir: str, name: str, keep: str):
+    # Tables built from older parameters will never be read again.
+    for file_name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, file_name)
+        if file_name.startswith(name + '-') and file_name.endswith('.bin') and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
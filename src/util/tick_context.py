@@ -0,0 +1,159 @@
+from typing import Tuple
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.orientation import Orientation
+from util.packet_views import PacketViews, packet_views
+from util.prediction_arrays import PredictionArrays
+from util.prediction_cache import PredictionCache
+from util.vec import Vec3, Vec3Array
+
+# Goal centers on a standard arena. Team 0 (blue) defends negative y.
+BLUE_GOAL = Vec3(0, -5120, 0)
+ORANGE_GOAL = Vec3(0, 5120, 0)
+
+
+class _Snapshot:
+    """
+    Base for the per-tick snapshot classes. Instances are filled in once by __init__ and are read-only afterwards,
+    so every part of the bot can share them without worrying about someone else changing the values mid-tick.
+    """
+    # https://docs.python.org/3/reference/datamodel.html#slots
+    __slots__ = []
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+
+class CarState(_Snapshot):
+    """
+    Everything we read about a single car in one packet: location, velocity and orientation are decoded exactly once.
+    TickContext builds these from the packet's NumPy views; for fields not copied here, index PacketViews.cars.
+    """
+    __slots__ = [
+        'index',
+        'team',
+        'location',
+        'velocity',
+        'orientation',
+        'speed',
+        'boost',
+        'has_wheel_contact',
+        'is_demolished',
+    ]
+
+    def __init__(self, index: int, team: int, location: Vec3, velocity: Vec3, orientation: Orientation, boost: int,
+                 has_wheel_contact: bool, is_demolished: bool):
+        _set = object.__setattr__
+        _set(self, 'index', index)
+        _set(self, 'team', team)
+        _set(self, 'location', location)
+        _set(self, 'velocity', velocity)
+        _set(self, 'orientation', orientation)
+        _set(self, 'speed', velocity.length())
+        _set(self, 'boost', boost)
+        _set(self, 'has_wheel_contact', has_wheel_contact)
+        _set(self, 'is_demolished', is_demolished)
+
+
+class TickContext(_Snapshot):
+    """
+    A read-only snapshot of one GameTickPacket from our bot's point of view. Build it once at the top of get_output
+    and hand it to every decision path instead of the raw packet, so nothing decodes the packet or rebuilds an
+    Orientation a second time during the same tick.
+
+    The ball prediction comes from a PredictionCache owned by whoever builds the context. `prediction` is the
+    current PredictionArrays, and `prediction_cache` remembers analyses of it (intercepts, ground touches, goals)
+    across ticks. `views` gives NumPy access to all cars and pads at once, and `opponent_locations` has every
+    opponent's location as one Vec3Array for geometry against all of them.
+    """
+    __slots__ = [
+        'packet',
+        'views',
+        'time',
+        'index',
+        'team',
+        'car',
+        'cars',
+        'opponents',
+        'teammates',
+        'opponent_locations',
+        'ball_location',
+        'ball_velocity',
+        'ball_speed',
+        'my_goal',
+        'opponent_goal',
+        'dist_to_ball',
+        'dist_ball_to_my_goal',
+        'dist_ball_to_opponent_goal',
+        'prediction',
+        'prediction_cache',
+    ]
+
+    def __init__(self, packet: GameTickPacket, index: int, team: int, prediction_cache: PredictionCache):
+        views = packet_views(packet)
+        cars = _read_cars(views, packet.game_info.frame_num)
+        car = cars[index]
+        ball_physics = views.ball['physics']
+        ball_location = Vec3.from_xyz(*ball_physics['location'].tolist())
+        ball_velocity = Vec3.from_xyz(*ball_physics['velocity'].tolist())
+        if team == 0:
+            my_goal, opponent_goal = BLUE_GOAL, ORANGE_GOAL
+        else:
+            my_goal, opponent_goal = ORANGE_GOAL, BLUE_GOAL
+
+        _set = object.__setattr__
+        _set(self, 'packet', packet)
+        _set(self, 'views', views)
+        _set(self, 'time', packet.game_info.seconds_elapsed)
+        _set(self, 'index', index)
+        _set(self, 'team', team)
+        _set(self, 'car', car)
+        _set(self, 'cars', cars)
+        _set(self, 'opponents', tuple(c for c in cars if c.team != team))
+        _set(self, 'teammates', tuple(c for c in cars if c.team == team and c.index != index))
+        _set(self, 'opponent_locations', Vec3Array(views.car_locations[views.cars['team'] != team]))
+        _set(self, 'ball_location', ball_location)
+        _set(self, 'ball_velocity', ball_velocity)
+        _set(self, 'ball_speed', ball_velocity.length())
+        _set(self, 'my_goal', my_goal)
+        _set(self, 'opponent_goal', opponent_goal)
+        _set(self, 'dist_to_ball', car.location.dist(ball_location))
+        _set(self, 'dist_ball_to_my_goal', ball_location.dist(my_goal))
+        _set(self, 'dist_ball_to_opponent_goal', ball_location.dist(opponent_goal))
+        _set(self, 'prediction', prediction_cache.prediction)
+        _set(self, 'prediction_cache', prediction_cache)
+
+
+# The cars read from the last packet and the (views, frame, car count) they were read for. get_output can run more
+# than once in the same game frame, and the cars (orientations especially) are then not decoded again.
+_last_cars: Tuple[Tuple, Tuple[CarState, ...]] = (None, ())
+
+
+def _read_cars(views: PacketViews, frame: int) -> Tuple[CarState, ...]:
+    global _last_cars
+    key = (views, frame, views.packet.num_cars)
+    if _last_cars[0] != key:
+        _last_cars = (key, _decode_cars(views))
+    return _last_cars[1]
+
+
+def _decode_cars(views: PacketViews) -> Tuple[CarState, ...]:
+    # Pull each column out of the packet in one call instead of touching ctypes fields car by car.
+    cars = views.cars
+    physics = cars['physics']
+    locations = physics['location'].tolist()
+    velocities = physics['velocity'].tolist()
+    rotations = physics['rotation'].tolist()
+    teams = cars['team'].tolist()
+    boosts = cars['boost'].tolist()
+    wheel_contacts = cars['has_wheel_contact'].tolist()
+    demolished = cars['is_demolished'].tolist()
+    return tuple(
+        CarState(i, teams[i], Vec3.from_xyz(*locations[i]), Vec3.from_xyz(*velocities[i]),
+                 Orientation.from_angles(*rotations[i]), boosts[i], wheel_contacts[i], demolished[i])
+        for i in range(len(locations))
+    )
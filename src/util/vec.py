@@ -1,6 +1,7 @@
 import math
-from typing import Union
+from typing import Iterable, Iterator, Union
 
+import numpy as np
 from rlbot.utils.structures.game_data_struct import Vector3
 
 
@@ -13,6 +14,9 @@ class Vec3:
 
     Remember that the in-game axis are left-handed.
 
+    In code that runs many times a tick, prefer the cheaper forms: Vec3.from_xyz() / from_struct() over the
+    constructor, dist_sq() when only comparing distances, flat_dist() over flat().dist(other.flat()).
+
     When in doubt visit the wiki: https://github.com/RLBot/RLBot/wiki/Useful-Game-Values
     """
     # https://docs.python.org/3/reference/datamodel.html#slots
@@ -43,27 +47,49 @@ class Vec3:
             self.y = float(y)
             self.z = float(z)
 
+    @staticmethod
+    def from_xyz(x: float, y: float, z: float) -> 'Vec3':
+        """
+        Create a new Vec3 from three floats without the checks and conversions of the constructor. Only use it when
+        the components are already Python floats (math results, .tolist() output), not NumPy scalars or ints.
+        """
+        vec = _new(Vec3)
+        vec.x = x
+        vec.y = y
+        vec.z = z
+        return vec
+
+    @staticmethod
+    def from_struct(vector: 'Vector3') -> 'Vec3':
+        """Create a new Vec3 from a packet's Vector3, whose components are already floats."""
+        vec = _new(Vec3)
+        vec.x = vector.x
+        vec.y = vector.y
+        vec.z = vector.z
+        return vec
+
     def __getitem__(self, item: int):
         return (self.x, self.y, self.z)[item]
 
     def __add__(self, other: 'Vec3') -> 'Vec3':
-        return Vec3(self.x + other.x, self.y + other.y, self.z + other.z)
+        return _vec3(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other: 'Vec3') -> 'Vec3':
-        return Vec3(self.x - other.x, self.y - other.y, self.z - other.z)
+        return _vec3(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __neg__(self):
-        return Vec3(-self.x, -self.y, -self.z)
+        return _vec3(-self.x, -self.y, -self.z)
 
     def __mul__(self, scale: float) -> 'Vec3':
-        return Vec3(self.x * scale, self.y * scale, self.z * scale)
+        scale = float(scale)
+        return _vec3(self.x * scale, self.y * scale, self.z * scale)
 
     def __rmul__(self, scale):
         return self * scale
 
     def __truediv__(self, scale: float) -> 'Vec3':
         scale = 1 / float(scale)
-        return self * scale
+        return _vec3(self.x * scale, self.y * scale, self.z * scale)
 
     def __str__(self):
         return f"Vec3({self.x:.2f}, {self.y:.2f}, {self.z:.2f})"
@@ -73,7 +99,7 @@ class Vec3:
 
     def flat(self):
         """Returns a new Vec3 that equals this Vec3 but projected onto the ground plane. I.e. where z=0."""
-        return Vec3(self.x, self.y, 0)
+        return _vec3(self.x, self.y, 0.0)
 
     def length(self):
         """Returns the length of the vector. Also called magnitude and norm."""
@@ -81,32 +107,241 @@ class Vec3:
 
     def dist(self, other: 'Vec3') -> float:
         """Returns the distance between this vector and another vector using pythagoras."""
-        return (self - other).length()
+        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
+
+    def dist_sq(self, other: 'Vec3') -> float:
+        """Returns the squared distance to another vector. Cheaper than dist() when you only compare distances."""
+        return (self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2
+
+    def flat_dist(self, other: 'Vec3') -> float:
+        """Returns the distance to another vector on the ground plane, ignoring z. Same as flat().dist(other.flat())."""
+        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
 
     def normalized(self):
         """Returns a vector with the same direction but a length of one. Returns zero vector if length is zero."""
         len_self = self.length()
         if len_self == 0:
-            return Vec3(0, 0, 0)
-        return self / len_self
+            return _vec3(0.0, 0.0, 0.0)
+        scale = 1 / len_self
+        return _vec3(self.x * scale, self.y * scale, self.z * scale)
 
     def rescale(self, new_len: float) -> 'Vec3':
         """Returns a vector with the same direction but a different length."""
-        return new_len * self.normalized()
+        len_self = self.length()
+        if len_self == 0:
+            return _vec3(0.0, 0.0, 0.0)
+        scale = 1 / len_self
+        new_len = float(new_len)
+        return _vec3(self.x * scale * new_len, self.y * scale * new_len, self.z * scale * new_len)
 
     def dot(self, other: 'Vec3') -> float:
         """Returns the dot product."""
         return self.x*other.x + self.y*other.y + self.z*other.z
 
+    def dot_normalized(self, other: 'Vec3') -> float:
+        """
+        Returns the dot product of both vectors normalized, i.e. the cosine of the angle between them, without
+        building the normalized vectors. Returns 0 if either has length zero.
+        """
+        lengths = self.length() * other.length()
+        if lengths == 0:
+            return 0.0
+        return self.dot(other) / lengths
+
     def cross(self, other: 'Vec3') -> 'Vec3':
         """Returns the cross product."""
-        return Vec3(
+        return _vec3(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x
         )
 
+    def lerp(self, other: 'Vec3', t: float) -> 'Vec3':
+        """Returns the point t of the way from this vector to other (t=0 gives this one, t=1 gives other)."""
+        t = float(t)
+        return _vec3(self.x + (other.x - self.x) * t, self.y + (other.y - self.y) * t, self.z + (other.z - self.z) * t)
+
+    def project(self, onto: 'Vec3') -> 'Vec3':
+        """Returns the part of this vector along onto. Returns zero vector if onto has length zero."""
+        onto_sq = onto.dot(onto)
+        if onto_sq == 0:
+            return _vec3(0.0, 0.0, 0.0)
+        scale = self.dot(onto) / onto_sq
+        return _vec3(onto.x * scale, onto.y * scale, onto.z * scale)
+
     def ang_to(self, ideal: 'Vec3') -> float:
         """Returns the angle to the ideal vector. Angle will be between 0 and pi."""
         cos_ang = self.dot(ideal) / (self.length() * ideal.length())
         return math.acos(cos_ang)
+
+    # In-place variants for accumulating into a vector you own, e.g. summing forces in a loop. They change this
+    # vector and return it. Everything else treats Vec3s as immutable and shares them freely (the goal constants,
+    # snapshot fields), so never call these on a vector you didn't create yourself.
+
+    def add_in_place(self, other: 'Vec3') -> 'Vec3':
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def sub_in_place(self, other: 'Vec3') -> 'Vec3':
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def scale_in_place(self, scale: float) -> 'Vec3':
+        scale = float(scale)
+        self.x *= scale
+        self.y *= scale
+        self.z *= scale
+        return self
+
+
+_new = object.__new__
+
+
+def _vec3(x: float, y: float, z: float) -> Vec3:
+    # Same as Vec3.from_xyz, as a plain function so the operators above don't pay for the attribute lookup.
+    vec = _new(Vec3)
+    vec.x = x
+    vec.y = y
+    vec.z = z
+    return vec
+
+
+class Vec3Array:
+    """
+    Many vectors at once, backed by an (N, 3) NumPy array: all car locations, all pad locations, every slice of the
+    ball prediction. It has the same methods as Vec3, but each one answers for every row in one vectorized call:
+    dist() gives an (N,) array of distances, cross() another Vec3Array, and so on.
+
+    Anywhere a method takes another vector, pass a Vec3 to use it against every row, or a Vec3Array (or (N, 3)
+    array) of the same length to pair the rows up. With + and -, keep the Vec3Array on the left. Indexing with an int
+    gives a Vec3; a slice or mask gives a Vec3Array.
+
+    The array isn't copied, so a Vec3Array over one of the packet views (see util/packet_views.py) stays current as
+    RLBot rewrites the packet.
+    """
+    __slots__ = [
+        'data'
+    ]
+
+    def __init__(self, data: Union[np.ndarray, Iterable]):
+        data = np.asarray(data, dtype=float) if not isinstance(data, np.ndarray) else data
+        self.data = data.reshape(-1, 3)
+
+    @staticmethod
+    def from_vecs(vecs: Iterable[Vec3]) -> 'Vec3Array':
+        """Packs Vec3s (or anything with x, y and z) into a Vec3Array."""
+        return Vec3Array([(v.x, v.y, v.z) for v in vecs])
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, item) -> Union[Vec3, 'Vec3Array']:
+        if isinstance(item, (int, np.integer)):
+            return Vec3.from_xyz(*self.data[item].tolist())
+        return Vec3Array(self.data[item])
+
+    def __iter__(self) -> Iterator[Vec3]:
+        return (Vec3.from_xyz(*row) for row in self.data.tolist())
+
+    def __add__(self, other) -> 'Vec3Array':
+        return Vec3Array(self.data + _rows(other))
+
+    def __sub__(self, other) -> 'Vec3Array':
+        return Vec3Array(self.data - _rows(other))
+
+    def __neg__(self):
+        return Vec3Array(-self.data)
+
+    def __mul__(self, scale) -> 'Vec3Array':
+        """Scales every row by the same number, or each row by its own from an (N,) array."""
+        return Vec3Array(self.data * _scales(scale))
+
+    def __rmul__(self, scale):
+        return self * scale
+
+    def __truediv__(self, scale) -> 'Vec3Array':
+        return Vec3Array(self.data / _scales(scale))
+
+    def __str__(self):
+        return f"Vec3Array({len(self)} vectors)"
+
+    def __repr__(self):
+        return f"Vec3Array({self.data!r})"
+
+    def flat(self) -> 'Vec3Array':
+        """Returns the vectors projected onto the ground plane. I.e. where z=0."""
+        flat = self.data.astype(float)
+        flat[:, 2] = 0
+        return Vec3Array(flat)
+
+    def length(self) -> np.ndarray:
+        """Returns the (N,) lengths of the vectors."""
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def dist(self, other) -> np.ndarray:
+        """Returns the (N,) distances between these vectors and another vector, or the rows of another array."""
+        offset = self.data - _rows(other)
+        return np.sqrt(np.einsum('ij,ij->i', offset, offset))
+
+    def normalized(self) -> 'Vec3Array':
+        """Returns vectors with the same directions but a length of one. Rows of length zero stay zero."""
+        length = self.length()
+        return Vec3Array(self.data / np.where(length == 0, 1, length)[:, None])
+
+    def rescale(self, new_len) -> 'Vec3Array':
+        """Returns vectors with the same directions but a different length (one for all, or an (N,) array)."""
+        return self.normalized() * new_len
+
+    def dot(self, other) -> np.ndarray:
+        """Returns the (N,) dot products."""
+        other = _rows(other)
+        if other.ndim == 1:
+            return self.data @ other
+        return np.einsum('ij,ij->i', self.data, other)
+
+    def cross(self, other) -> 'Vec3Array':
+        """Returns the cross products."""
+        return Vec3Array(np.cross(self.data, _rows(other)))
+
+    def ang_to(self, ideal) -> np.ndarray:
+        """
+        Returns the (N,) angles to the ideal vector (or vectors). Angles will be between 0 and pi, and NaN where
+        either vector has length zero.
+        """
+        ideal = _rows(ideal)
+        ideal_length = np.sqrt(np.einsum('...i,...i->...', ideal, ideal))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cos_ang = self.dot(ideal) / (self.length() * ideal_length)
+        return np.arccos(np.clip(cos_ang, -1, 1))
+
+
+def _rows(other) -> np.ndarray:
+    # The other side of a Vec3Array operation as something that broadcasts against its (N, 3) data.
+    if isinstance(other, Vec3Array):
+        return other.data
+    if isinstance(other, Vec3):
+        return np.array((other.x, other.y, other.z))
+    return np.asarray(other, dtype=float)
+
+
+def _scales(scale) -> Union[float, np.ndarray]:
+    # A per-row scale needs a trailing axis to broadcast over x, y and z.
+    if isinstance(scale, np.ndarray) and scale.ndim == 1:
+        return scale[:, None]
+    return scale